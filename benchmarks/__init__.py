@@ -0,0 +1,4 @@
+"""
+Benchmarks
+Headless timing and memory benchmarks for the election package
+"""
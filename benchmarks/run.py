@@ -0,0 +1,280 @@
+"""
+Benchmark Runner
+Times data generation, page aggregations and predictions across dataset sizes
+
+Usage (from the repository root):
+
+    python -m benchmarks.run                       # default sizes, compare to baseline
+    python -m benchmarks.run --sizes 1k 100k --cases home voting
+    python -m benchmarks.run --save-baseline       # store this run as the baseline
+    python -m benchmarks.run --check               # exit 1 on regressions or missing baselines
+
+Every (case, size) runs in a fresh spawned process so peak RSS is per case.
+Wall time is the best of ``--repeat`` runs; allocations are measured in a
+separate tracemalloc pass so tracing does not distort the timings.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from election import pages
+from election.generator import build_election_data, DEFAULT_PARTIES
+from election.schema import compact_frame
+from election.aggregates import AggregateCube
+from election.registry import DatasetEntry
+from election.prediction_model import predict_winner_ensemble
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, 'baseline.json')
+RESULTS_DIR = os.path.join(HERE, 'results')
+
+DEFAULT_SIZES = ('1k', '10k', '100k', '1m', '10m')
+SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_size(text):
+    """'10k' -> 10000, '1m' -> 1000000"""
+    text = text.lower()
+    if text[-1] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+def dataset_shape(rows):
+    """Regions and constituencies per region giving roughly ``rows`` rows"""
+    n_regions = 5 if rows < 100_000 else 10
+    per_region = max(1, round(rows / (n_regions * len(DEFAULT_PARTIES))))
+    return n_regions, per_region
+
+
+def generate(rows, seed=42):
+    """Same pipeline as the app's generate_election_data"""
+    n_regions, per_region = dataset_shape(rows)
+    return compact_frame(build_election_data(n_regions, per_region, DEFAULT_PARTIES, seed))
+
+
+# ============================================================================
+# CASES
+# ============================================================================
+# Each case is (setup, run): setup(frame) prepares untimed state, run(state)
+# is the timed body. Page cases call the same election.pages builders as
+# the app on a fresh dataset entry (cube already built), so derived tables
+# and memoized slices are measured on a cold first render.
+
+def _cube(frame):
+    return AggregateCube(frame)
+
+
+def _entry(frame):
+    entry = DatasetEntry(1, frame, None)
+    entry.aggregates
+    return entry
+
+
+def _table_page(entry, column, ascending, rows=None):
+    """First page of the paginated table, as paginated_table slices it"""
+    positions = pages.sort_index(entry).positions(column, ascending, rows)
+    entry.frame.iloc[positions[:50]]
+
+
+def _home(entry):
+    pages.home_data(entry)
+
+
+def _voting(entry):
+    cube = entry.aggregates
+    data = pages.voting_data(entry, cube.regions[0], cube.parties[0])
+    _table_page(entry, 'votes', False, data['rows'])
+
+
+def _counting(entry):
+    pages.counting_data(entry)
+    _table_page(entry, 'counting_status', True)
+
+
+def _module1(entry):
+    pages.module1_data(entry)
+    pages.vote_box(entry)
+    pages.vote_share_bins(entry)
+
+
+def _module2(entry):
+    pages.module2_data(entry, entry.aggregates.regions[:3])
+
+
+def _anomalies(entry):
+    pages.anomalies(entry).flags()
+
+
+CASES = {
+    'generate': (lambda frame: len(frame), generate),
+    'cube': (lambda frame: frame, _cube),
+    'home': (_entry, _home),
+    'voting': (_entry, _voting),
+    'counting': (_entry, _counting),
+    'module1': (_entry, _module1),
+    'module2': (_entry, _module2),
+    'anomalies': (_entry, _anomalies),
+    'predict_ensemble': (_cube, predict_winner_ensemble),
+}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(case, rows, repeat):
+    """Measure one case in the current process"""
+    setup, body = CASES[case]
+    frame = generate(rows)
+    rss_before = peak_rss_mb()
+
+    times = []
+    for _ in range(repeat):
+        state = setup(frame)
+        start = time.perf_counter()
+        body(state)
+        times.append(time.perf_counter() - start)
+
+    state = setup(frame)
+    tracemalloc.start()
+    body(state)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'case': case,
+        'rows': len(frame),
+        'wall_s': min(times),
+        'wall_mean_s': float(np.mean(times)),
+        'repeat': repeat,
+        'alloc_peak_mb': peak / 1e6,
+        'alloc_retained_mb': current / 1e6,
+        'rss_peak_mb': peak_rss_mb(),
+        'rss_case_mb': peak_rss_mb() - rss_before,
+    }
+
+
+# ============================================================================
+# REGRESSION COMPARISON
+# ============================================================================
+
+def compare(results, baseline, time_tolerance=0.15, alloc_tolerance=0.10, min_seconds=0.001):
+    """Per-case ratios against a baseline; cases missing from it are marked ``missing``"""
+    previous = {(r['case'], r['rows']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in results:
+        base = previous.get((result['case'], result['rows']))
+        if base is None:
+            rows.append({'case': result['case'], 'rows': result['rows'], 'wall_s': result['wall_s'],
+                         'missing': True, 'regression': False})
+            continue
+        time_ratio = result['wall_s'] / max(base['wall_s'], 1e-9)
+        alloc_ratio = result['alloc_peak_mb'] / max(base['alloc_peak_mb'], 1e-9)
+        slower = (time_ratio > 1 + time_tolerance
+                  and result['wall_s'] - base['wall_s'] > min_seconds)
+        bigger = (alloc_ratio > 1 + alloc_tolerance
+                  and result['alloc_peak_mb'] - base['alloc_peak_mb'] > 1)
+        rows.append({
+            'case': result['case'], 'rows': result['rows'],
+            'wall_s': result['wall_s'], 'baseline_wall_s': base['wall_s'],
+            'time_ratio': round(time_ratio, 3), 'alloc_ratio': round(alloc_ratio, 3),
+            'missing': False, 'regression': slower or bigger,
+        })
+    return rows
+
+
+def format_table(results, comparison):
+    ratios = {(c['case'], c['rows']): c for c in comparison}
+    lines = [f"{'case':<18}{'rows':>12}{'wall ms':>12}{'alloc MB':>11}{'rss MB':>10}{'vs base':>10}"]
+    for r in results:
+        c = ratios.get((r['case'], r['rows']))
+        if c is None or c['missing']:
+            ratio = 'no base'
+        else:
+            ratio = f"{c['time_ratio']:.2f}x" + (' !' if c['regression'] else '')
+        lines.append(f"{r['case']:<18}{r['rows']:>12,}{r['wall_s'] * 1000:>12.2f}"
+                     f"{r['alloc_peak_mb']:>11.1f}{r['rss_peak_mb']:>10.0f}{ratio:>10}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per case (1 above a million rows)')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true', help='exit 1 if any case regressed')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed wall time increase')
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size in map(parse_size, args.sizes):
+        repeat = args.repeat if size <= 1_000_000 else 1
+        for case in args.cases:
+            with context.Pool(1, maxtasksperchild=1) as pool:
+                result = pool.apply(run_case, (case, size, repeat))
+            results.append(result)
+            print(f"{case:<18}{result['rows']:>12,}  {result['wall_s'] * 1000:10.2f} ms", flush=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    elif not args.save_baseline:
+        print(f"WARNING: no baseline at {args.baseline}; nothing to compare against", file=sys.stderr)
+    comparison = compare(results, baseline, time_tolerance=args.tolerance)
+    regressions = [c for c in comparison if c['regression']]
+    missing = [c for c in comparison if c['missing']]
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+        'comparison': comparison,
+        'regressions': regressions,
+        'missing': missing,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print()
+    print(format_table(results, comparison))
+    print(f"\nResults written to {output}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+    if missing and not args.save_baseline:
+        print(f"WARNING: {len(missing)} case(s) have no baseline entry: "
+              + ', '.join(f"{c['case']}@{c['rows']:,}" for c in missing), file=sys.stderr)
+    if args.check and (regressions or missing):
+        # A check that compared nothing must not pass
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+Election Result Statistical Analysis Portal
+Core data and analysis engines used by the Streamlit application
+"""
@@ -0,0 +1,281 @@
+"""
+Aggregate Cube
+Party x region x status x constituency rollups computed once per dataset
+"""
+
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from election.matrix import VoteMatrix
+from election.memo import Memo
+
+
+def dataset_fingerprint(df):
+    """Stable content hash of an election frame, used as a cache key"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=12)
+    digest.update(','.join(df.columns).encode())
+    return digest.hexdigest()
+
+
+class AggregateCube:
+    """Precomputed rollups of one election frame
+
+    All sums are held as NumPy arrays over integer-coded party, region,
+    constituency and status axes. Pages read small labelled views or
+    memoized slices instead of scanning the raw rows on every rerun, and
+    live count updates adjust the arrays in place (see ``apply_deltas``).
+    Updates hold ``lock``; views derived from the cube memoize under the
+    same lock so they are never built from a half-applied batch.
+    """
+
+    def __init__(self, df):
+        self._frame = df
+        self.n_rows = len(df)
+
+        matrix = self.matrix = VoteMatrix.from_frame(df)
+        self.region_index = matrix.region_index
+        self.constituency_index = matrix.constituency_index
+        self.party_index = matrix.party_index
+        self.status_index = matrix.status_index
+
+        # Constituency dimension and running sums share the matrix buffers,
+        # so in-place updates keep both views consistent
+        self.const_region = matrix.const_region
+        self.const_electorate = matrix.const_electorate
+        self.const_party_votes = matrix.votes
+        self.const_party_counted = matrix.counted
+        self.party_counted_votes = matrix.counted.sum(axis=0)
+        self.region_party_votes = matrix.region_sums(matrix.votes)
+        self.region_status_rows = matrix.region_sums(matrix.status_counts())
+        self.region_electorate = matrix.region_sums(matrix.const_electorate)
+        self.region_constituencies = np.bincount(matrix.const_region, minlength=len(self.region_index))
+
+        self.lock = threading.RLock()
+        self._party_stats = None
+        self._memo = Memo(self.lock)
+
+    def __getstate__(self):
+        # Locks do not pickle; a copy sent to a job worker gets its own
+        state = self.__dict__.copy()
+        del state['lock'], state['_memo']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+        self._memo = Memo(self.lock)
+
+    # ------------------------------------------------------------------
+    # Labelled views
+    # ------------------------------------------------------------------
+
+    @property
+    def regions(self):
+        return list(self.region_index)
+
+    @property
+    def parties(self):
+        return list(self.party_index)
+
+    @property
+    def party_votes(self):
+        return pd.Series(self.region_party_votes.sum(axis=0), index=self.party_index, name='votes')
+
+    @property
+    def party_counted(self):
+        return pd.Series(self.party_counted_votes, index=self.party_index, name='counted_votes')
+
+    @property
+    def region_votes(self):
+        return pd.Series(self.region_party_votes.sum(axis=1), index=self.region_index, name='votes')
+
+    @property
+    def region_party(self):
+        return pd.DataFrame(self.region_party_votes, index=self.region_index,
+                            columns=self.party_index, copy=False)
+
+    @property
+    def constituency_party(self):
+        return pd.DataFrame(self.const_party_votes, index=self.constituency_index,
+                            columns=self.party_index, copy=False)
+
+    @property
+    def status_counts(self):
+        return pd.Series(self.region_status_rows.sum(axis=0), index=self.status_index)
+
+    @property
+    def party_stats(self):
+        """Per-party vote distribution statistics (recomputed lazily after updates)"""
+        stats = self._party_stats
+        if stats is None:
+            with self.lock:
+                stats = self._party_stats
+                if stats is None:
+                    stats = self._party_stats = self._build_party_stats()
+        return stats
+
+    def _build_party_stats(self):
+        return self._frame.groupby('party', observed=True, sort=False).agg(
+            total_votes=('votes', 'sum'),
+            mean_votes=('votes', 'mean'),
+            median_votes=('votes', 'median'),
+            std_votes=('votes', 'std'),
+            min_votes=('votes', 'min'),
+            max_votes=('votes', 'max'),
+            count=('votes', 'count'),
+            avg_share=('vote_share_pct', 'mean'),
+        )
+
+    # ------------------------------------------------------------------
+    # Scalar metrics
+    # ------------------------------------------------------------------
+
+    @property
+    def total_votes(self):
+        return int(self.region_party_votes.sum())
+
+    @property
+    def n_constituencies(self):
+        return len(self.constituency_index)
+
+    @property
+    def electorate(self):
+        return int(self.const_electorate.sum())
+
+    @property
+    def turnout_pct(self):
+        return self.total_votes / self.electorate * 100 if self.electorate else 0.0
+
+    @property
+    def leading_party(self):
+        return self.party_index[int(self.region_party_votes.sum(axis=0).argmax())]
+
+    def status_count(self, status):
+        return int(self.region_status_rows[:, self.status_index.get_loc(status)].sum())
+
+    # ------------------------------------------------------------------
+    # Filtered slices (memoized per filter combination)
+    # ------------------------------------------------------------------
+
+    def party_distribution(self, region=None, party=None):
+        """Votes by party under an optional region/party filter"""
+        key = ('party_distribution', region, party)
+        def build():
+            if region is None:
+                votes = self.party_votes
+            else:
+                votes = self.region_party.loc[region].rename('votes')
+            if party is not None:
+                votes = votes[[party]]
+            return votes.rename_axis('party').reset_index()
+        return self._memo.get(key, build)
+
+    def top_constituencies(self, region=None, party=None, n=10):
+        """The n constituencies with the most votes under a filter"""
+        key = ('top_constituencies', region, party, n)
+        def build():
+            matrix = self.const_party_votes
+            rows = np.arange(len(matrix))
+            if region is not None:
+                rows = np.flatnonzero(self.const_region == self.region_index.get_loc(region))
+            if party is not None:
+                totals = matrix[rows, self.party_index.get_loc(party)]
+            else:
+                totals = matrix[rows].sum(axis=1)
+            top = pd.Series(totals, index=self.constituency_index[rows], name='votes').nlargest(n)
+            return top.rename_axis('constituency_name').reset_index()
+        return self._memo.get(key, build)
+
+    def region_status_frame(self):
+        """Row counts by region and counting status"""
+        counts = pd.DataFrame(self.region_status_rows, index=self.region_index,
+                              columns=self.status_index).stack().rename('count')
+        return counts[counts > 0].reset_index()
+
+    def _region_rows(self, regions):
+        codes = self.region_index.get_indexer(list(regions))
+        return codes[codes >= 0]
+
+    def regional_slice(self, regions):
+        """Region x party totals restricted to the selected regions"""
+        rows = self._region_rows(regions)
+        return pd.DataFrame(self.region_party_votes[rows], index=self.region_index[rows],
+                            columns=self.party_index)
+
+    def region_summary(self, regions=None):
+        """Votes, electorate, turnout and counting progress per region"""
+        key = ('region_summary', tuple(regions) if regions is not None else None)
+        def build():
+            rows = np.arange(len(self.region_index)) if regions is None else self._region_rows(regions)
+            votes = self.region_party_votes[rows].sum(axis=1)
+            electorate = self.region_electorate[rows]
+            status = self.region_status_rows[rows]
+            cells = np.maximum(status.sum(axis=1), 1)
+            summary = pd.DataFrame({
+                'constituencies': self.region_constituencies[rows],
+                'votes': votes,
+                'electorate': electorate,
+                'turnout_pct': np.round(np.divide(votes * 100.0, electorate, out=np.zeros(len(rows)),
+                                                  where=electorate > 0), 2),
+            }, index=self.region_index[rows])
+            for code, status_name in enumerate(self.status_index):
+                summary[f"{status_name.lower().replace(' ', '_')}_pct"] = np.round(status[:, code] * 100.0 / cells, 1)
+            return summary
+        return self._memo.get(key, build)
+
+    def region_party_stats(self, regions):
+        """Long region x party frame: votes, share, index vs national share and rank
+
+        ``index_vs_national`` is the party's regional share as a percentage
+        of its national share (100 = in line with the country).
+        """
+        key = ('region_party_stats', tuple(regions))
+        def build():
+            rows = self._region_rows(regions)
+            votes = self.region_party_votes[rows]
+            totals = votes.sum(axis=1, keepdims=True)
+            share = np.divide(votes * 100.0, totals, out=np.zeros(votes.shape), where=totals > 0)
+            national = self.region_party_votes.sum(axis=0)
+            national_share = national * 100.0 / max(national.sum(), 1)
+            index = np.divide(share * 100.0, national_share, out=np.zeros(share.shape),
+                              where=national_share > 0)
+            rank = (-votes).argsort(axis=1, kind='stable').argsort(axis=1) + 1
+            n_party = votes.shape[1]
+            return pd.DataFrame({
+                'region': np.repeat(np.asarray(self.region_index, dtype=object)[rows], n_party),
+                'party': np.tile(np.asarray(self.party_index, dtype=object), len(rows)),
+                'votes': votes.ravel(),
+                'share_pct': np.round(share.ravel(), 2),
+                'index_vs_national': np.round(index.ravel(), 1),
+                'rank': rank.ravel(),
+            })
+        return self._memo.get(key, build)
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def apply_deltas(self, delta):
+        """Fold a batch of count deltas into the running sums in O(batch)"""
+        np.add.at(self.const_party_votes, (delta.const_codes, delta.party_codes), delta.d_votes)
+        np.add.at(self.const_party_counted, (delta.const_codes, delta.party_codes), delta.d_counted)
+        np.add.at(self.region_party_votes, (delta.region_codes, delta.party_codes), delta.d_votes)
+        np.add.at(self.party_counted_votes, delta.party_codes, delta.d_counted)
+        np.add.at(self.region_status_rows, (delta.region_codes, delta.old_status), -1)
+        np.add.at(self.region_status_rows, (delta.region_codes, delta.new_status), 1)
+        self.matrix.status[delta.const_codes, delta.party_codes] = delta.new_status
+        if delta.d_votes.any():
+            self._party_stats = None
+        self._memo.clear()
+
+
+def predict_inputs(cube):
+    """Party statistics in the layout expected by the ensemble predictor"""
+    stats = cube.party_stats[['total_votes', 'mean_votes', 'std_votes', 'count', 'avg_share']]
+    stats = stats.reset_index()
+    stats.columns = ['party', 'total_votes', 'avg_votes', 'std_votes', 'count', 'avg_share']
+    return stats
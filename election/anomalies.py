@@ -0,0 +1,229 @@
+"""
+Anomaly Detection
+Robust z-scores, turnout outliers and digit tests over the vote matrix
+"""
+
+import numpy as np
+import pandas as pd
+
+from election.memo import Memo
+
+Z_THRESHOLD = 3.5           # Iglewicz-Hoaglin cut-off for modified z-scores
+DIGIT_P_THRESHOLD = 0.001
+MIN_DIGIT_VALUE = 10        # last-digit test only on multi-digit counts
+
+BENFORD = np.log10(1 + 1 / np.arange(1, 10))
+
+
+def segment_medians(values, present, starts, counts):
+    """Per-segment, per-column medians of region-sorted rows, ignoring absent cells
+
+    ``values`` is (rows, columns) already ordered by segment; ``starts``
+    are segment offsets and ``counts`` the (segments, columns) number of
+    present cells. Absent cells are sorted to the end of their segment.
+    """
+    n_rows = len(values)
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n_rows)))
+    top = values.max(initial=0) + 1
+    key = segment[:, None] * (2 * top + 1) + np.where(present, values, 2 * top)
+    ordered = np.take_along_axis(values, np.argsort(key, axis=0, kind='stable'), axis=0)
+    cols = np.arange(values.shape[1])
+    n = np.maximum(counts, 1)
+    lo = starts[:, None] + (n - 1) // 2
+    hi = starts[:, None] + n // 2
+    medians = (ordered[lo, cols] + ordered[hi, cols]) / 2.0
+    return np.where(counts > 0, medians, np.nan)
+
+
+def leading_digits(values, present):
+    """First and last decimal digits of present cells (-1 where not tested)"""
+    magnitude = np.floor(np.log10(np.maximum(values, 1)))
+    first = np.where(present & (values > 0), values // 10 ** magnitude, -1).astype(np.int8)
+    last = np.where(present & (values >= MIN_DIGIT_VALUE), values % 10, -1).astype(np.int8)
+    return first, last
+
+
+class AnomalyDetector:
+    """Suspicious-return checks kept in step with live count updates
+
+    Per cell: modified z-score of votes against the median/MAD of the same
+    party in the same region (detect_anomalies, made robust), and
+    over-counts. Per constituency: turnout above 100% and turnout
+    z-scores within the region. Per party: Benford first-digit and uniform
+    last-digit chi-square tests. Updates re-score only the touched
+    constituencies against the stored region baselines, which are
+    refreshed every ``refresh_every`` batches.
+
+    Over-counts are never visible in the matrix itself: the loader rejects
+    counted votes above votes and ingestion raises votes to cover them.
+    ``over_count`` is the running constituency x party record of those
+    raises (``DatasetEntry.over_count``), read when flags are built.
+    """
+
+    def __init__(self, cube, refresh_every=20, over_count=None):
+        self.cube = cube
+        self.over_count = over_count
+        self.refresh_every = refresh_every
+        self.batches = 0
+        matrix = cube.matrix
+        n_const, n_party = matrix.shape
+        self.cell_z = np.zeros((n_const, n_party), dtype=np.float32)
+        self.turnout = np.zeros(n_const, dtype=np.float64)
+        self.turnout_z = np.zeros(n_const, dtype=np.float32)
+        self.first_digit = np.full((n_const, n_party), -1, dtype=np.int8)
+        self.last_digit = np.full((n_const, n_party), -1, dtype=np.int8)
+        self.digit_counts = np.zeros((n_party, 10), dtype=np.int64)
+        self.last_counts = np.zeros((n_party, 10), dtype=np.int64)
+        self._memo = Memo(cube.lock)
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """Recompute region baselines and score every constituency"""
+        matrix = self.cube.matrix
+        order, starts = matrix.region_order, matrix.region_starts
+        present = matrix.status >= 0
+        votes = matrix.votes
+        counts = matrix.region_sums(present.astype(np.int64))
+
+        self.median = segment_medians(votes[order], present[order], starts, counts)
+        deviation = np.abs(votes - self.median[matrix.const_region])
+        self.mad = segment_medians(deviation[order], present[order], starts, counts)
+
+        turnout = self._turnout(slice(None))
+        ones = np.ones((len(turnout), 1), dtype=bool)
+        t_counts = matrix.region_sums(np.ones((len(turnout), 1), dtype=np.int64))
+        self.turnout_median = segment_medians(turnout[order, None], ones, starts, t_counts)[:, 0]
+        t_dev = np.abs(turnout - self.turnout_median[matrix.const_region])
+        self.turnout_mad = segment_medians(t_dev[order, None], ones, starts, t_counts)[:, 0]
+
+        self._score(np.arange(matrix.shape[0]))
+
+    def _turnout(self, rows):
+        matrix = self.cube.matrix
+        electorate = matrix.const_electorate[rows]
+        totals = matrix.votes[rows].sum(axis=1)
+        return np.divide(totals * 100.0, electorate, out=np.zeros(len(totals)), where=electorate > 0)
+
+    def _score(self, rows):
+        matrix = self.cube.matrix
+        region = matrix.const_region[rows]
+        votes = matrix.votes[rows]
+        present = matrix.status[rows] >= 0
+
+        mad = np.maximum(np.nan_to_num(self.mad[region], nan=1.0), 1.0)
+        z = 0.6745 * (votes - self.median[region]) / mad
+        self.cell_z[rows] = np.where(present, np.nan_to_num(z), 0)
+
+        turnout = self._turnout(rows)
+        self.turnout[rows] = turnout
+        t_mad = np.maximum(np.nan_to_num(self.turnout_mad[region], nan=1.0), 1e-6)
+        self.turnout_z[rows] = 0.6745 * (turnout - self.turnout_median[region]) / t_mad
+
+        # Digit tallies: remove the old digits of these cells, add the new ones
+        party = np.broadcast_to(np.arange(votes.shape[1]), votes.shape)
+        first, last = leading_digits(votes, present)
+        for counts, digits, new in ((self.digit_counts, self.first_digit, first),
+                                    (self.last_counts, self.last_digit, last)):
+            old = digits[rows]
+            np.subtract.at(counts, (party[old >= 0], old[old >= 0]), 1)
+            np.add.at(counts, (party[new >= 0], new[new >= 0]), 1)
+            digits[rows] = new
+
+    def apply_deltas(self, delta):
+        """Re-score the constituencies touched by a count batch"""
+        self.batches += 1
+        if self.batches % self.refresh_every == 0:
+            self.refresh()
+        else:
+            self._score(np.unique(delta.const_codes))
+        self._memo.clear()
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def flags(self, threshold=Z_THRESHOLD):
+        """One row per flagged cell or constituency, most severe first"""
+        key = ('flags', threshold)
+        def build():
+            cube, matrix = self.cube, self.cube.matrix
+            names = np.asarray(cube.constituency_index, dtype=object)
+            regions = np.asarray(cube.region_index, dtype=object)[matrix.const_region]
+            parties = np.asarray(cube.party_index, dtype=object)
+            parts = []
+
+            def add(check, const, party, value, score):
+                parts.append(pd.DataFrame({
+                    'constituency_name': names[const], 'region': regions[const],
+                    'party': parties[party] if party is not None else None,
+                    'check': check, 'value': value, 'score': score}))
+
+            const, party = np.nonzero(np.abs(self.cell_z) > threshold)
+            add('vote_z_score', const, party, matrix.votes[const, party],
+                np.round(self.cell_z[const, party], 2))
+            if self.over_count is not None:
+                const, party = np.nonzero(self.over_count)
+                over = self.over_count[const, party]
+                projected = matrix.votes[const, party] - over
+                add('over_count', const, party, over,
+                    np.round(np.divide(over * 100.0, projected, out=over * 1.0, where=projected > 0), 2))
+            const = np.flatnonzero(self.turnout > 100)
+            add('turnout_over_100', const, None, np.round(self.turnout[const], 2),
+                np.round(self.turnout[const] - 100, 2))
+            const = np.flatnonzero(np.abs(self.turnout_z) > threshold)
+            add('turnout_z_score', const, None, np.round(self.turnout[const], 2),
+                np.round(self.turnout_z[const], 2))
+
+            flags = pd.concat(parts, ignore_index=True)
+            flags['severity'] = flags['score'].abs()
+            return flags.sort_values('severity', ascending=False, ignore_index=True)
+        return self._memo.get(key, build)
+
+    def digit_tests(self):
+        """Benford first-digit and uniform last-digit chi-square tests per party
+
+        Benford's law only applies to counts spanning several orders of
+        magnitude, so the first-digit test is flagged only for parties whose
+        5th-95th percentile vote range covers at least two.
+        """
+        return self._memo.get('digits', self._digit_tests)
+
+    def _digit_tests(self):
+        from scipy.stats import chi2
+
+        matrix = self.cube.matrix
+        votes = np.where(matrix.status >= 0, matrix.votes, np.nan).astype(np.float64)
+        p5, p95 = np.nanpercentile(np.where(votes > 0, votes, np.nan), [5, 95], axis=0)
+        benford_applies = np.log10(np.maximum(p95, 1) / np.maximum(p5, 1)) >= 2
+
+        rows = []
+        for test, counts, expected in (('benford_first_digit', self.digit_counts[:, 1:], BENFORD),
+                                       ('last_digit', self.last_counts, np.full(10, 0.1))):
+            n = counts.sum(axis=1)
+            exp = n[:, None] * expected
+            stat = np.divide((counts - exp) ** 2, exp, out=np.zeros(exp.shape), where=exp > 0).sum(axis=1)
+            p_value = chi2.sf(stat, len(expected) - 1)
+            applies = benford_applies if test == 'benford_first_digit' else np.ones(len(n), dtype=bool)
+            for p, party in enumerate(self.cube.party_index):
+                rows.append((party, test, int(n[p]), round(float(stat[p]), 2), float(p_value[p]),
+                             bool(applies[p])))
+        tests = pd.DataFrame(rows, columns=['party', 'test', 'n', 'chi2', 'p_value', 'applicable'])
+        tests['flagged'] = tests['applicable'] & (tests['p_value'] < DIGIT_P_THRESHOLD) & (tests['n'] >= 50)
+        return tests
+
+    def digit_distribution(self, test='benford_first_digit'):
+        """Observed vs expected digit frequencies across all parties"""
+        if test == 'benford_first_digit':
+            counts, expected, digits = self.digit_counts[:, 1:].sum(axis=0), BENFORD, np.arange(1, 10)
+        else:
+            counts, expected, digits = self.last_counts.sum(axis=0), np.full(10, 0.1), np.arange(10)
+        return pd.DataFrame({'digit': digits, 'observed': counts / max(counts.sum(), 1),
+                             'expected': expected})
+
+    def summary(self):
+        flags = self.flags()
+        return flags['check'].value_counts().to_dict()
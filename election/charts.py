@@ -0,0 +1,145 @@
+"""
+Chart Preparation
+Server-side summaries that keep Plotly payloads bounded regardless of data size
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+MAX_OUTLIERS = 50
+
+
+# ============================================================================
+# BOX PLOTS
+# ============================================================================
+
+def box_stats(df, group, value, max_outliers=MAX_OUTLIERS):
+    """Quartiles, Tukey whiskers and a capped outlier sample per group
+
+    Returns (stats, outliers): one row of summary statistics per group and
+    at most ``max_outliers`` of the most extreme outlying points per group.
+    """
+    grouped = df.groupby(group, observed=True, sort=False)[value]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    stats['mean'] = grouped.mean()
+    stats['min'] = grouped.min()
+    stats['max'] = grouped.max()
+    stats['count'] = grouped.size()
+
+    iqr = stats['q3'] - stats['q1']
+    low_limit = (stats['q1'] - 1.5 * iqr).reindex(df[group]).to_numpy()
+    high_limit = (stats['q3'] + 1.5 * iqr).reindex(df[group]).to_numpy()
+    values = df[value].to_numpy()
+    inside = (values >= low_limit) & (values <= high_limit)
+
+    # Whiskers end at the most extreme points inside the fences
+    fenced = pd.DataFrame({group: df[group].to_numpy(), value: np.where(inside, values, np.nan)})
+    fences = fenced.groupby(group, observed=True, sort=False)[value].agg(['min', 'max'])
+    stats['lowerfence'] = fences['min']
+    stats['upperfence'] = fences['max']
+
+    outliers = pd.DataFrame({group: df[group].to_numpy()[~inside], value: values[~inside]})
+    if len(outliers):
+        distance = (outliers[value] - outliers[group].map(stats['median']).astype(float)).abs()
+        outliers = (outliers.assign(_distance=distance.to_numpy())
+                            .sort_values('_distance', ascending=False)
+                            .groupby(group, observed=True, sort=False).head(max_outliers)
+                            .drop(columns='_distance'))
+    return stats.reset_index(), outliers.reset_index(drop=True)
+
+
+def box_figure(stats, outliers, group, value, title=None):
+    """Box plot drawn from precomputed statistics instead of raw points"""
+    fig = go.Figure()
+    for _, row in stats.iterrows():
+        fig.add_trace(go.Box(
+            name=str(row[group]), x=[str(row[group])],
+            q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+            lowerfence=[row['lowerfence']], upperfence=[row['upperfence']],
+            mean=[row['mean']], boxpoints=False,
+        ))
+        points = outliers[outliers[group] == row[group]]
+        if len(points):
+            fig.add_trace(go.Scatter(
+                x=[str(row[group])] * len(points), y=points[value], mode='markers',
+                marker=dict(size=5, opacity=0.6), showlegend=False,
+                name=f"{row[group]} outliers",
+            ))
+    fig.update_layout(title=title, yaxis_title=value, xaxis_title=group)
+    return fig
+
+
+# ============================================================================
+# HISTOGRAMS
+# ============================================================================
+
+def histogram_bins(values, bins=40, value_range=None):
+    """NumPy-binned histogram as a (bin_start, bin_end, bin_mid, count) frame"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return pd.DataFrame({
+        'bin_start': edges[:-1],
+        'bin_end': edges[1:],
+        'bin_mid': (edges[:-1] + edges[1:]) / 2,
+        'count': counts,
+    })
+
+
+def histogram_figure(binned, title=None, x_title=None):
+    """Bar chart of pre-binned counts"""
+    fig = go.Figure(go.Bar(x=binned['bin_mid'], y=binned['count'],
+                           width=(binned['bin_end'] - binned['bin_start']).to_numpy()))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title='count', bargap=0.02)
+    return fig
+
+
+# ============================================================================
+# TIME SERIES
+# ============================================================================
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling to at most ``threshold`` points
+
+    Keeps the first and last points and, from each interior bucket, the
+    point forming the largest triangle with the previous pick and the
+    next bucket's mean. Returns the selected positions.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+    # Mean of every bucket, used as the third triangle vertex of the previous bucket
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    widths = np.maximum(stops - starts, 1)
+    mean_x = (cum_x[stops] - cum_x[starts]) / widths
+    mean_y = (cum_y[stops] - cum_y[starts]) / widths
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i, (start, stop) in enumerate(zip(starts, stops)):
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((x[prev] - next_x[i]) * (by - y[prev]) - (x[prev] - bx) * (next_y[i] - y[prev]))
+        prev = start + int(area.argmax())
+        selected[i + 1] = prev
+    return selected
+
+
+def downsample(df, x, y, max_points=2000):
+    """Rows of ``df`` reduced with LTTB on (x, y) when longer than max_points"""
+    if len(df) <= max_points:
+        return df
+    x_values = df[x]
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype('int64')
+    return df.iloc[lttb(x_values.to_numpy(), df[y].to_numpy(), max_points)]
@@ -0,0 +1,129 @@
+"""
+Constituency Dimension
+One row per constituency (id, region, electorate, status) and turnout statistics
+"""
+
+import numpy as np
+import pandas as pd
+
+from election.memo import Memo
+
+TURNOUT_BINS = (45, 60, 75)
+TURNOUT_CATEGORIES = ('Low (<45%)', 'Medium (45-60%)', 'High (60-75%)', 'Very High (75%+)')
+
+COMPLETE, IN_PROGRESS, PENDING = 0, 1, 2
+
+
+def constituency_status(status_counts):
+    """Complete when every party row is complete, Pending when none has started"""
+    present = status_counts.sum(axis=1)
+    return np.where(status_counts[:, COMPLETE] == present, COMPLETE,
+                    np.where(status_counts[:, PENDING] == present, PENDING, IN_PROGRESS)).astype(np.int8)
+
+
+class ConstituencyTable:
+    """Constituency dimension table next to the party-level fact rows
+
+    ``total_voters`` is held once per constituency instead of on every
+    party row, so electorate and turnout figures are sums over
+    n_constituencies values rather than groupbys over the long frame.
+    Votes cast and status are kept current from count deltas.
+    """
+
+    def __init__(self, cube):
+        self.cube = cube
+        matrix = cube.matrix
+        self.ids = matrix.const_ids
+        self.region = matrix.const_region
+        self.total_voters = matrix.const_electorate
+        self.votes_cast = matrix.votes.sum(axis=1)
+        self.status = constituency_status(matrix.status_counts())
+        self._memo = Memo(cube.lock)
+
+    def apply_deltas(self, delta):
+        """Fold a count batch into votes cast and re-derive touched statuses"""
+        np.add.at(self.votes_cast, delta.const_codes, delta.d_votes)
+        touched = np.unique(delta.const_codes)
+        status = self.cube.matrix.status[touched]
+        counts = np.stack([(status == code).sum(axis=1) for code in range(len(self.cube.status_index))], axis=1)
+        self.status[touched] = constituency_status(counts)
+        self._memo.clear()
+
+    # ------------------------------------------------------------------
+    # Totals
+    # ------------------------------------------------------------------
+
+    @property
+    def electorate(self):
+        return int(self.total_voters.sum())
+
+    @property
+    def turnout(self):
+        """Per-constituency turnout (%)"""
+        return np.divide(self.votes_cast * 100.0, self.total_voters,
+                         out=np.zeros(len(self.votes_cast)), where=self.total_voters > 0)
+
+    @property
+    def turnout_pct(self):
+        electorate = self.electorate
+        return self.votes_cast.sum() / electorate * 100 if electorate else 0.0
+
+    # ------------------------------------------------------------------
+    # Tables
+    # ------------------------------------------------------------------
+
+    def frame(self):
+        """The dimension table with votes cast and turnout"""
+        def build():
+            cube = self.cube
+            turnout = self.turnout
+            return pd.DataFrame({
+                'constituency_id': self.ids,
+                'constituency_name': cube.constituency_index,
+                'region': pd.Categorical.from_codes(self.region, cube.region_index),
+                'total_voters': self.total_voters,
+                'status': pd.Categorical.from_codes(self.status, cube.status_index),
+                'votes_cast': self.votes_cast,
+                'turnout_pct': np.round(turnout, 2),
+                'turnout_category': pd.Categorical.from_codes(
+                    np.searchsorted(TURNOUT_BINS, turnout, side='right'), TURNOUT_CATEGORIES),
+            })
+        return self._memo.get('frame', build)
+
+    def turnout_stats(self):
+        """calculate_turnout_stats: constituencies by turnout, highest first"""
+        return self.frame().sort_values('turnout_pct', ascending=False, ignore_index=True)
+
+    def region_turnout(self):
+        """Distribution of constituency turnout per region"""
+        def build():
+            cube = self.cube
+            turnout = self.turnout
+            order = np.lexsort((turnout, self.region))
+            counts = np.bincount(self.region, minlength=len(cube.region_index))
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            ordered = turnout[order]
+
+            def quantile(q):
+                pos = starts + (np.maximum(counts, 1) - 1) * q
+                lo, hi = np.floor(pos).astype(np.int64), np.ceil(pos).astype(np.int64)
+                return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+            votes = np.bincount(self.region, weights=self.votes_cast, minlength=len(counts))
+            voters = np.bincount(self.region, weights=self.total_voters, minlength=len(counts))
+            return pd.DataFrame({
+                'constituencies': counts,
+                'turnout_pct': np.round(np.divide(votes * 100, voters, out=np.zeros(len(counts)),
+                                                  where=voters > 0), 2),
+                'min': np.round(quantile(0.0), 2),
+                'p25': np.round(quantile(0.25), 2),
+                'median': np.round(quantile(0.5), 2),
+                'p75': np.round(quantile(0.75), 2),
+                'max': np.round(quantile(1.0), 2),
+            }, index=cube.region_index)
+        return self._memo.get('region_turnout', build)
+
+    def category_counts(self):
+        """Constituencies per turnout category"""
+        return self.frame()['turnout_category'].value_counts(sort=False).rename_axis('turnout_category') \
+            .reset_index(name='constituencies')
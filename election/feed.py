@@ -0,0 +1,327 @@
+"""
+Live Results Feed
+Asyncio consumer of newline-delimited JSON count updates with backpressure
+
+Sources are given as URLs:
+
+    tcp://host:port         read lines from a TCP socket
+    unix:///path/to/socket  read lines from a Unix socket
+    file:///path/to/file    tail a file (rotation/truncation aware)
+    http(s)://host/path     stream a chunked NDJSON response
+
+Each line is one update: {"constituency_name": ..., "party": ...,
+"counted_votes": <increment>, "counting_status": <optional>}.
+
+Run ``python -m election.feed serve --port 8765`` for a local stand-in
+server that streams random updates for the synthetic dataset.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import deque
+from urllib.parse import urlparse
+
+RECONNECT_DELAY = (0.5, 10.0)   # first and maximum backoff in seconds
+READ_BYTES = 1 << 20            # file tail read size
+
+
+class FeedStats:
+    """Counters shared between the feed thread and the UI"""
+
+    def __init__(self):
+        self.lines = 0
+        self.parse_errors = 0
+        self.updates = 0
+        self.batches = 0
+        self.apply_errors = 0
+        self.rejected = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.blocked_seconds = 0.0
+        self.blocked_puts = 0
+        self.reconnects = 0
+        self.last_error = None
+        self.last_batch_at = None
+        self.apply_seconds = deque(maxlen=200)
+
+    def snapshot(self):
+        latencies = sorted(self.apply_seconds)
+        return {
+            'lines': self.lines,
+            'parse_errors': self.parse_errors,
+            'updates_applied': self.updates,
+            'updates_rejected': self.rejected,
+            'batches': self.batches,
+            'apply_errors': self.apply_errors,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'blocked_puts': self.blocked_puts,
+            'blocked_seconds': round(self.blocked_seconds, 3),
+            'reconnects': self.reconnects,
+            'apply_p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+            'last_batch_at': self.last_batch_at,
+            'last_error': self.last_error,
+        }
+
+
+# ============================================================================
+# LINE SOURCES
+# ============================================================================
+
+async def socket_lines(url):
+    if url.scheme == 'unix':
+        reader, writer = await asyncio.open_unix_connection(url.path)
+    else:
+        reader, writer = await asyncio.open_connection(url.hostname, url.port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield line
+    finally:
+        writer.close()
+
+
+async def file_lines(url, poll=0.25):
+    path = url.path
+    position = 0
+    inode = None
+    partial = b''
+    while True:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            await asyncio.sleep(poll)
+            continue
+        if stat.st_ino != inode or stat.st_size < position:
+            inode, position, partial = stat.st_ino, 0, b''   # rotated or truncated
+        if stat.st_size > position:
+            with open(path, 'rb') as f:
+                f.seek(position)
+                data = f.read(READ_BYTES)
+            position += len(data)
+            *lines, partial = (partial + data).split(b'\n')
+            for line in lines:
+                yield line
+        else:
+            await asyncio.sleep(poll)
+
+
+async def http_lines(url):
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(None, lambda: urllib.request.urlopen(url.geturl(), timeout=60))
+    try:
+        while True:
+            line = await loop.run_in_executor(None, response.readline)
+            if not line:
+                return
+            yield line
+    finally:
+        response.close()
+
+
+SOURCES = {'tcp': socket_lines, 'unix': socket_lines, 'file': file_lines,
+           'http': http_lines, 'https': http_lines}
+
+
+# ============================================================================
+# CONSUMER
+# ============================================================================
+
+class FeedConsumer:
+    """Reads a feed on a background event loop and applies it in batches
+
+    Parsed updates go through a bounded queue: when the applier falls
+    behind, the reader waits on the queue instead of buffering, which in
+    turn stops it reading from the source (socket backpressure). Updates
+    are grouped into batches of at most ``max_batch`` or whatever arrived
+    within ``batch_window`` seconds, and ``apply(batch)`` runs off the
+    event loop so slow applies never stall reading.
+    """
+
+    def __init__(self, source, apply, batch_window=1.0, max_batch=10_000, queue_size=50_000):
+        self.url = urlparse(source)
+        if self.url.scheme not in SOURCES:
+            raise ValueError(f"Unsupported feed source: {source}")
+        self.source = source
+        self.apply = apply
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.stats = FeedStats()
+        self._loop = None
+        self._thread = None
+        self._stopping = None
+
+    # ------------------------------------------------------------------
+    # Thread control
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name='election-feed')
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        queue = asyncio.Queue(self.queue_size)
+        tasks = [asyncio.create_task(self._read(queue)), asyncio.create_task(self._batch(queue))]
+        await self._stopping.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Reader and batcher
+    # ------------------------------------------------------------------
+
+    async def _read(self, queue):
+        delay = RECONNECT_DELAY[0]
+        reader = SOURCES[self.url.scheme]
+        while True:
+            try:
+                async for line in reader(self.url):
+                    delay = RECONNECT_DELAY[0]
+                    await self._put(queue, line)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.stats.last_error = repr(exc)
+            self.stats.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY[1])
+
+    async def _put(self, queue, line):
+        line = line.strip()
+        if not line:
+            return
+        self.stats.lines += 1
+        try:
+            update = json.loads(line)
+            if not isinstance(update, dict):
+                raise ValueError('update is not an object')
+        except ValueError:
+            self.stats.parse_errors += 1
+            return
+        if queue.full():
+            started = time.perf_counter()
+            self.stats.blocked_puts += 1
+            await queue.put(update)
+            self.stats.blocked_seconds += time.perf_counter() - started
+        else:
+            queue.put_nowait(update)
+        depth = queue.qsize()
+        self.stats.queue_depth = depth
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+    async def _batch(self, queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            self.stats.queue_depth = queue.qsize()
+            await self._apply(loop, batch)
+
+    async def _apply(self, loop, batch):
+        started = time.perf_counter()
+        try:
+            summary = await loop.run_in_executor(None, self.apply, batch)
+        except Exception as exc:
+            self.stats.apply_errors += 1
+            self.stats.last_error = repr(exc)
+            return
+        self.stats.apply_seconds.append(time.perf_counter() - started)
+        self.stats.batches += 1
+        self.stats.updates += len(batch)
+        if isinstance(summary, dict):
+            self.stats.rejected += summary.get('rejected', 0)
+        self.stats.last_batch_at = time.strftime('%H:%M:%S')
+
+
+# ============================================================================
+# LOCAL STAND-IN SERVER
+# ============================================================================
+
+def random_updates(frame, rng, n):
+    """``n`` random count increments for rows of an election frame"""
+    rows = rng.integers(0, len(frame), n)
+    names = frame['constituency_name'].astype(str).to_numpy()[rows]
+    parties = frame['party'].astype(str).to_numpy()[rows]
+    increments = rng.integers(0, 500, n)
+    finish = rng.random(n) < 0.05
+    for name, party, inc, done in zip(names, parties, increments, finish):
+        update = {'constituency_name': name, 'party': party, 'counted_votes': int(inc)}
+        if done:
+            update['counting_status'] = 'Complete'
+        yield update
+
+
+async def serve_updates(frame, host='127.0.0.1', port=8765, rate=200, seed=0):
+    """Stream ``rate`` random updates per second to every TCP client"""
+    import numpy as np
+
+    async def client(reader, writer):
+        rng = np.random.default_rng(seed)
+        try:
+            while True:
+                lines = ''.join(json.dumps(u) + '\n' for u in random_updates(frame, rng, max(rate // 10, 1)))
+                writer.write(lines.encode())
+                await writer.drain()
+                await asyncio.sleep(0.1)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(client, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    from election.generator import build_election_data
+
+    parser = argparse.ArgumentParser(description='Local stand-in results feed')
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve = sub.add_parser('serve', help='stream random updates over TCP')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--rate', type=int, default=200, help='updates per second')
+    args = parser.parse_args(argv)
+    asyncio.run(serve_updates(build_election_data(), args.host, args.port, args.rate))
+
+
+if __name__ == '__main__':
+    main()
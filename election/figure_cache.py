@@ -0,0 +1,100 @@
+"""
+Figure Cache
+Memory-capped LRU of serialized Plotly figures shared by every session
+"""
+
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+
+def normalize_filters(filters):
+    """Hashable, order-independent form of a page's filter state"""
+    if not filters:
+        return ()
+    items = []
+    for name, value in sorted(filters.items()):
+        if isinstance(value, (list, tuple, set, frozenset)):
+            value = tuple(sorted(map(str, value)))
+        elif isinstance(value, float):
+            value = round(value, 6)
+        items.append((name, value))
+    return tuple(items)
+
+
+class FigureCache:
+    """LRU cache of figure JSON keyed by (dataset key, page, chart, filters)
+
+    Entries are evicted least-recently-used first once the stored JSON
+    exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(dataset_key, page, chart, filters=None):
+        return (dataset_key, page, chart, normalize_filters(filters))
+
+    def get_json(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put_json(self, key, payload):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+
+    def get_or_build_json(self, key, builder):
+        """Cached figure JSON for ``key``, calling ``builder()`` only on a miss"""
+        payload = self.get_json(key)
+        if payload is None:
+            payload = builder().to_json()
+            self.put_json(key, payload)
+        return payload
+
+    def get_or_build(self, key, builder):
+        """Cached figure for ``key``, calling ``builder()`` only on a miss"""
+        return pio.from_json(self.get_or_build_json(key, builder))
+
+    def invalidate(self, dataset_key=None):
+        """Drop every entry, or only those built from one dataset key"""
+        with self._lock:
+            if dataset_key is None:
+                self._entries.clear()
+                self.bytes = 0
+                return
+            for key in [k for k in self._entries if k[0] == dataset_key]:
+                self.bytes -= len(self._entries.pop(key))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,104 @@
+"""
+Filter Index
+Precomputed row positions per dimension value for copy-free filtering
+"""
+
+import numpy as np
+import pandas as pd
+
+from election.generator import STATUSES
+from election.memo import Memo
+
+FILTER_DIMENSIONS = ('region', 'party', 'counting_status')
+
+
+class FilterView:
+    """Lazy result of a filter: row positions into a shared frame"""
+
+    def __init__(self, frame, rows):
+        self.frame = frame
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def to_frame(self, columns=None):
+        """Materialise the selected rows (and optionally columns)"""
+        view = self.frame.iloc[self.rows]
+        return view if columns is None else view[columns]
+
+
+class FilterIndex:
+    """Sorted row-position lists per region, party and status value
+
+    Combined filters start from the shortest position list and probe the
+    per-row codes of the other dimensions, so the cost is proportional to
+    the smallest matching set rather than the frame.
+    """
+
+    def __init__(self, frame, dimensions=FILTER_DIMENSIONS):
+        self.frame = frame
+        self.labels = {}
+        self.codes = {}
+        self._postings = Memo()
+        for dim in dimensions:
+            if dim == 'counting_status':
+                labels = pd.Index(list(STATUSES))
+                codes = labels.get_indexer(np.asarray(frame[dim], dtype=object))
+            else:
+                codes, uniques = pd.factorize(frame[dim], sort=False)
+                labels = pd.Index(np.asarray(uniques))
+            dtype = np.int8 if len(labels) < 128 else np.int32
+            self.labels[dim] = labels
+            self.codes[dim] = codes.astype(dtype)
+
+    def postings(self, dim):
+        """Sorted row positions for every value of one dimension"""
+        def build():
+            codes = self.codes[dim]
+            order = np.argsort(codes, kind='stable')
+            bounds = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(self.labels[dim])))
+            start = len(codes) - bounds[-1] if len(bounds) else 0
+            return np.split(order[start:], bounds[:-1])
+        return self._postings.get(dim, build)
+
+    def _values(self, dim, value):
+        values = value if isinstance(value, (list, tuple, set, np.ndarray, pd.Index)) else [value]
+        codes = self.labels[dim].get_indexer(list(values))
+        return codes[codes >= 0]
+
+    def rows(self, **filters):
+        """Row positions matching every given ``dimension=value(s)`` filter"""
+        active = {dim: self._values(dim, value) for dim, value in filters.items() if value is not None}
+        if not active:
+            return np.arange(len(self.frame))
+        if any(len(codes) == 0 for codes in active.values()):
+            # An unknown or empty selection on any dimension matches nothing
+            return np.empty(0, dtype=np.intp)
+
+        def size(dim):
+            return sum(len(self.postings(dim)[c]) for c in active[dim])
+
+        first = min(active, key=size)
+        lists = [self.postings(first)[c] for c in active[first]]
+        rows = lists[0] if len(lists) == 1 else np.sort(np.concatenate(lists))
+        for dim, codes in active.items():
+            if dim == first:
+                continue
+            row_codes = self.codes[dim][rows]
+            keep = row_codes == codes[0] if len(codes) == 1 else np.isin(row_codes, codes)
+            rows = rows[keep]
+        return rows
+
+    def view(self, **filters):
+        """Lazy FilterView for the given filters"""
+        return FilterView(self.frame, self.rows(**filters))
+
+    def apply_deltas(self, delta):
+        """Track status transitions from live count updates"""
+        if 'counting_status' in self.codes:
+            changed = delta.old_status != delta.new_status
+            if changed.any():
+                with self._postings.lock:
+                    self.codes['counting_status'][delta.rows[changed]] = delta.new_status[changed]
+                    self._postings.pop('counting_status')
@@ -0,0 +1,85 @@
+"""
+Synthetic Election Data Generator
+Vectorized generation of constituency x party vote rows
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_REGIONS = ('North', 'South', 'East', 'West', 'Central')
+DEFAULT_PARTIES = ('Party A', 'Party B', 'Party C', 'Party D', 'Independent')
+
+# Party strength ranges (share of turnout); unknown parties get the
+# 'Independent' range
+PARTY_STRENGTH = {
+    'Party A': (0.25, 0.35),
+    'Party B': (0.20, 0.30),
+    'Party C': (0.15, 0.25),
+    'Party D': (0.10, 0.20),
+}
+DEFAULT_STRENGTH = (0.05, 0.15)
+
+STATUSES = ('Complete', 'In Progress', 'Pending')
+STATUS_PROBABILITIES = (0.7, 0.25, 0.05)
+
+COLUMNS = [
+    'region', 'constituency_id', 'constituency_name', 'total_voters', 'party',
+    'votes', 'counting_status', 'counted_votes', 'total_constituency_votes',
+    'vote_share_pct',
+]
+
+
+def region_names(n_regions):
+    """Region labels: the five compass regions, then 'Region N'"""
+    names = list(DEFAULT_REGIONS[:n_regions])
+    names += [f"Region {i}" for i in range(len(names) + 1, n_regions + 1)]
+    return names
+
+
+def build_election_data(n_regions=5, constituencies_per_region=20,
+                        parties=DEFAULT_PARTIES, seed=42):
+    """Generate sample election data with every column drawn in bulk"""
+    rng = np.random.default_rng(seed)
+
+    regions = region_names(n_regions)
+    parties = list(parties)
+    n_parties = len(parties)
+    n_const = n_regions * constituencies_per_region
+    n_rows = n_const * n_parties
+
+    # Constituency level (one entry per constituency)
+    const_region = np.repeat(np.arange(n_regions), constituencies_per_region)
+    const_id = np.tile(np.arange(1, constituencies_per_region + 1), n_regions)
+    const_names = np.array([f"{regions[r]} Constituency {i}"
+                            for r, i in zip(const_region, const_id)], dtype=object)
+    total_voters = rng.integers(50000, 200000, n_const)
+
+    # Party level (rows are constituency-major, party-minor)
+    bounds = np.array([PARTY_STRENGTH.get(p, DEFAULT_STRENGTH) for p in parties])
+    turnout = rng.uniform(0.6, 0.85, n_rows)
+    strength = rng.uniform(np.tile(bounds[:, 0], n_const), np.tile(bounds[:, 1], n_const))
+
+    row_voters = np.repeat(total_voters, n_parties)
+    votes = (row_voters * turnout * strength).astype(np.int64)
+    status_codes = rng.choice(len(STATUSES), size=n_rows, p=STATUS_PROBABILITIES)
+    counted_votes = (votes * rng.uniform(0.75, 0.95, n_rows)).astype(np.int64)
+
+    const_totals = votes.reshape(n_const, n_parties).sum(axis=1)
+    row_totals = np.repeat(const_totals, n_parties)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.round(votes / row_totals * 100, 2)
+
+    df = pd.DataFrame({
+        'region': np.array(regions, dtype=object)[np.repeat(const_region, n_parties)],
+        'constituency_id': np.repeat(const_id, n_parties),
+        'constituency_name': np.repeat(const_names, n_parties),
+        'total_voters': row_voters,
+        'party': np.tile(np.array(parties, dtype=object), n_const),
+        'votes': votes,
+        'counting_status': np.array(STATUSES, dtype=object)[status_codes],
+        'counted_votes': counted_votes,
+        'total_constituency_votes': row_totals,
+        'vote_share_pct': share,
+    }, columns=COLUMNS)
+
+    return df
@@ -0,0 +1,144 @@
+"""
+Incremental Count Ingestion
+Applies batches of live count deltas to an election frame in place
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from election.generator import STATUSES
+
+# One entry per updated row; codes index the AggregateCube axes.
+# ``over_count`` is how far the count overtook the row's votes.
+CountDelta = namedtuple('CountDelta', [
+    'rows', 'const_codes', 'party_codes', 'region_codes',
+    'd_votes', 'd_counted', 'old_status', 'new_status', 'over_count',
+])
+
+UPDATE_COLUMNS = ['constituency_name', 'party', 'counted_votes', 'counting_status']
+
+# Columns written by live updates
+MUTABLE_COLUMNS = ['votes', 'counted_votes', 'counting_status',
+                   'total_constituency_votes', 'vote_share_pct']
+
+
+def normalize_updates(updates):
+    """Coerce a batch (DataFrame, dicts or records) to the update columns"""
+    batch = updates if isinstance(updates, pd.DataFrame) else pd.DataFrame(list(updates))
+    batch = batch.reindex(columns=UPDATE_COLUMNS)
+    batch['counted_votes'] = pd.to_numeric(batch['counted_votes'], errors='coerce').fillna(0)
+    return batch
+
+
+class CountIngestor:
+    """Applies count deltas to a frame and keeps its AggregateCube in step
+
+    Each batch row names a constituency and party, a ``counted_votes``
+    increment and optionally a new ``counting_status``. Counted votes can
+    never exceed ``votes``: when the count overtakes the projected total,
+    ``votes`` is raised to match and the constituency's
+    ``total_constituency_votes`` and ``vote_share_pct`` are refreshed for
+    the touched constituencies only. The raise is reported on the delta as
+    ``over_count`` so over-reporting feeds can still be flagged.
+    """
+
+    def __init__(self, frame, cube):
+        self.frame = frame
+        self.cube = cube
+
+        # Own the mutable columns once, so writes never land in buffers that
+        # are shared or read-only (e.g. a memory-mapped snapshot)
+        for column in MUTABLE_COLUMNS:
+            frame[column] = frame[column].copy()
+        self.n_parties = len(cube.party_index)
+
+        # Cell -> frame row and cell statuses come from the cube's vote matrix
+        self.row_of = cube.matrix.row_of.reshape(-1)
+        self.batches = 0
+        self.rows_updated = 0
+
+    def _write(self, column, rows, values):
+        col = self.frame.columns.get_loc(column)
+        dtype = self.frame[column].dtype
+        if isinstance(dtype, np.dtype):
+            values = np.asarray(values).astype(dtype, copy=False)
+        self.frame.iloc[rows, col] = values
+
+    def apply_batch(self, updates):
+        """Apply one batch; returns the CountDelta and a summary dict"""
+        batch = normalize_updates(updates)
+        cube = self.cube
+
+        const_codes = cube.constituency_index.get_indexer(batch['constituency_name'].astype(object))
+        party_codes = cube.party_index.get_indexer(batch['party'].astype(object))
+        known = (const_codes >= 0) & (party_codes >= 0)
+        rows = np.where(known, self.row_of[const_codes * self.n_parties + party_codes], -1)
+        status_given = batch['counting_status'].notna().to_numpy()
+        status_codes = cube.status_index.get_indexer(batch['counting_status'].astype(object))
+        valid = (rows >= 0) & (~status_given | (status_codes >= 0))
+        rejected = int((~valid).sum())
+
+        rows, const_codes, party_codes = rows[valid], const_codes[valid], party_codes[valid]
+        increments = batch['counted_votes'].to_numpy(dtype=np.int64)[valid]
+        status_given, status_codes = status_given[valid], status_codes[valid]
+
+        # Collapse repeated rows: increments add up, the last given status wins
+        urows, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+        u_const, u_party = const_codes[first], party_codes[first]
+        d_counted = np.zeros(len(urows), dtype=np.int64)
+        np.add.at(d_counted, inverse, increments)
+        old_status = cube.matrix.status[u_const, u_party].copy()
+        new_status = old_status.copy()
+        given = np.flatnonzero(status_given)
+        last = given[len(given) - 1 - np.unique(inverse[given][::-1], return_index=True)[1]]
+        new_status[inverse[last]] = status_codes[last]
+
+        old_counted = self.frame['counted_votes'].to_numpy(dtype=np.int64)[urows]
+        new_counted = np.maximum(old_counted + d_counted, 0)
+        d_counted = new_counted - old_counted
+        old_votes = self.frame['votes'].to_numpy(dtype=np.int64)[urows]
+        new_votes = np.maximum(old_votes, new_counted)
+        d_votes = new_votes - old_votes
+
+        delta = CountDelta(
+            rows=urows, const_codes=u_const, party_codes=u_party,
+            region_codes=cube.const_region[u_const],
+            d_votes=d_votes, d_counted=d_counted,
+            old_status=old_status, new_status=new_status,
+            over_count=np.maximum(new_counted - old_votes, 0),
+        )
+
+        self._write('counted_votes', urows, new_counted)
+        if (new_status != old_status).any():
+            changed = new_status != old_status
+            self._write('counting_status', urows[changed],
+                        np.asarray(STATUSES, dtype=object)[new_status[changed]])
+        cube.apply_deltas(delta)
+
+        touched = np.unique(u_const[d_votes != 0])
+        if len(touched):
+            self._write('votes', urows, new_votes)
+            self._refresh_shares(touched)
+
+        self.batches += 1
+        self.rows_updated += len(urows)
+        return delta, {
+            'applied': int(valid.sum()),
+            'rejected': rejected,
+            'rows_updated': len(urows),
+            'constituencies_resized': len(touched),
+        }
+
+    def _refresh_shares(self, const_codes):
+        """Recompute totals and shares for the given constituencies only"""
+        matrix = self.cube.const_party_votes[const_codes]
+        totals = matrix.sum(axis=1)
+        cell_rows = self.row_of.reshape(-1, self.n_parties)[const_codes]
+        present = cell_rows >= 0
+        rows = cell_rows[present]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = np.round(matrix / totals[:, None] * 100, 2)
+        self._write('total_constituency_votes', rows, np.broadcast_to(totals[:, None], matrix.shape)[present])
+        self._write('vote_share_pct', rows, shares[present])
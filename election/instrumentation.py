@@ -0,0 +1,247 @@
+"""
+Instrumentation
+Per-rerun span timings, latency percentiles, profiling and Prometheus export
+"""
+
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+_current = contextvars.ContextVar('election_trace', default=None)
+
+
+def payload_bytes(obj):
+    """Approximate size of a frame, array, string or figure payload"""
+    if obj is None:
+        return 0
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=False).sum())
+    if isinstance(obj, (pd.Series, np.ndarray)):
+        return int(obj.nbytes)
+    if isinstance(obj, (str, bytes)):
+        return len(obj)
+    return 0
+
+
+class Span:
+    """One timed phase of a rerun"""
+
+    __slots__ = ('name', 'start', 'seconds', 'rows', 'bytes')
+
+    def __init__(self, name, rows=0, payload=0):
+        self.name = name
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.add(rows, payload)
+
+    def add(self, rows=0, payload=None):
+        """Count rows processed and bytes produced by this span"""
+        self.rows += int(rows)
+        self.bytes += payload if isinstance(payload, int) else payload_bytes(payload)
+
+
+class RerunTrace:
+    """Spans recorded during one script rerun of one page"""
+
+    def __init__(self, page):
+        self.page = page
+        self.spans = []
+        self.seconds = 0.0
+        self.error = None
+
+
+@contextmanager
+def span(name, rows=0, payload=0):
+    """Time a phase of the current rerun (a no-op outside ``Metrics.rerun``)"""
+    trace = _current.get()
+    record = Span(name, rows, payload)
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - record.start
+        if trace is not None:
+            trace.spans.append(record)
+
+
+class Profile:
+    """cProfile (or pyinstrument when installed) capture of one rerun"""
+
+    def __init__(self, engine='cprofile'):
+        self.engine = 'pyinstrument' if engine == 'pyinstrument' and pyinstrument else 'cprofile'
+        self._profiler = None
+        self.report = None
+
+    def __enter__(self):
+        if self.engine == 'pyinstrument':
+            self._profiler = pyinstrument.Profiler()
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.engine == 'pyinstrument':
+            self._profiler.stop()
+            self.report = self._profiler.output_html()
+        else:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(40)
+            self.report = out.getvalue()
+        return False
+
+
+class Metrics:
+    """Process-wide store of rerun traces
+
+    Keeps the last ``window`` reruns per page for percentiles plus running
+    counters for the Prometheus export.
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._latency = defaultdict(lambda: deque(maxlen=window))
+        self._spans = defaultdict(lambda: deque(maxlen=window))
+        self._totals = defaultdict(lambda: [0, 0.0, 0, 0])   # reruns, seconds, rows, bytes
+        self._errors = defaultdict(int)
+
+    @contextmanager
+    def rerun(self, page):
+        """Trace one page render; spans opened inside are attached to it"""
+        trace = RerunTrace(page)
+        token = _current.set(trace)
+        start = time.perf_counter()
+        try:
+            yield trace
+        except Exception as exc:
+            trace.error = repr(exc)
+            raise
+        finally:
+            trace.seconds = time.perf_counter() - start
+            _current.reset(token)
+            self.record(trace)
+
+    def record(self, trace):
+        with self._lock:
+            self._latency[trace.page].append(trace.seconds)
+            totals = self._totals[trace.page]
+            totals[0] += 1
+            totals[1] += trace.seconds
+            if trace.error:
+                self._errors[trace.page] += 1
+            for record in trace.spans:
+                self._spans[trace.page, record.name].append(
+                    (record.seconds, record.rows, record.bytes))
+                totals[2] += record.rows
+                totals[3] += record.bytes
+
+    def page_latency(self):
+        """p50/p95/max latency in ms per page over the recent window"""
+        with self._lock:
+            rows = [(page, len(samples), *np.percentile(np.asarray(samples) * 1000, [50, 95, 100]))
+                    for page, samples in self._latency.items() if samples]
+        return pd.DataFrame(rows, columns=['page', 'reruns', 'p50_ms', 'p95_ms', 'max_ms'])
+
+    def span_summary(self):
+        """Latency percentiles and mean rows/bytes per page phase"""
+        with self._lock:
+            rows = []
+            for (page, name), samples in self._spans.items():
+                values = np.asarray(samples, dtype=np.float64)
+                p50, p95 = np.percentile(values[:, 0] * 1000, [50, 95])
+                rows.append((page, name, len(values), p50, p95,
+                             values[:, 1].mean(), values[:, 2].mean()))
+        return pd.DataFrame(rows, columns=['page', 'span', 'count', 'p50_ms', 'p95_ms',
+                                           'mean_rows', 'mean_bytes'])
+
+    def prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = [
+            '# HELP election_page_render_seconds Page render latency over the recent window',
+            '# TYPE election_page_render_seconds summary',
+        ]
+        with self._lock:
+            for page, samples in self._latency.items():
+                if not samples:
+                    continue
+                label = _label(page)
+                for q in (0.5, 0.95):
+                    value = np.quantile(np.asarray(samples), q)
+                    lines.append(f'election_page_render_seconds{{page="{label}",quantile="{q}"}} {value:.6f}')
+                reruns, seconds, _, _ = self._totals[page]
+                lines.append(f'election_page_render_seconds_sum{{page="{label}"}} {seconds:.6f}')
+                lines.append(f'election_page_render_seconds_count{{page="{label}"}} {reruns}')
+            for name, index, help_text in (('rows', 2, 'Rows processed by page spans'),
+                                           ('payload_bytes', 3, 'Payload bytes produced by page spans')):
+                lines.append(f'# HELP election_page_{name}_total {help_text}')
+                lines.append(f'# TYPE election_page_{name}_total counter')
+                for page, totals in self._totals.items():
+                    lines.append(f'election_page_{name}_total{{page="{_label(page)}"}} {totals[index]}')
+            lines.append('# HELP election_page_errors_total Reruns that raised')
+            lines.append('# TYPE election_page_errors_total counter')
+            for page, count in self._errors.items():
+                lines.append(f'election_page_errors_total{{page="{_label(page)}"}} {count}')
+            lines.append('# HELP election_span_seconds Page phase latency over the recent window')
+            lines.append('# TYPE election_span_seconds summary')
+            for (page, name), samples in self._spans.items():
+                values = np.asarray([s[0] for s in samples])
+                for q in (0.5, 0.95):
+                    lines.append(f'election_span_seconds{{page="{_label(page)}",span="{_label(name)}",'
+                                 f'quantile="{q}"}} {np.quantile(values, q):.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def dump_prometheus(self, path):
+        """Write the Prometheus text dump to ``path`` (atomically)"""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+        return path
+
+
+def _label(value):
+    """Prometheus label value: ASCII text without emoji or quotes"""
+    text = value.encode('ascii', 'ignore').decode().strip()
+    return text.replace('\\', '\\\\').replace('"', '\\"') or 'unnamed'
+
+
+def serve_prometheus(metrics, port, host='127.0.0.1'):
+    """Serve ``/metrics`` from a daemon thread; returns the server"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name='election-metrics').start()
+    return server
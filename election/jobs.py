@@ -0,0 +1,184 @@
+"""
+Background Jobs
+Process-pool job runner with job ids, progress reporting and cancellation
+"""
+
+import hashlib
+import inspect
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = 'pending', 'running', 'done', 'failed', 'cancelled'
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+
+class JobContext:
+    """Handle passed to job functions that accept a ``job`` argument"""
+
+    def __init__(self, job_id, shared):
+        self.job_id = job_id
+        self._shared = shared
+
+    def progress(self, fraction, message=None):
+        """Report progress (0..1) and stop if the job was cancelled"""
+        state = dict(self._shared.get(self.job_id, {}))
+        if state.get('cancel'):
+            raise JobCancelled(self.job_id)
+        state.update(progress=float(fraction), message=message)
+        self._shared[self.job_id] = state
+
+    def cancelled(self):
+        return bool(self._shared.get(self.job_id, {}).get('cancel'))
+
+
+def _run_job(job_id, shared, fn, args, kwargs):
+    """Worker-side entry point"""
+    state = dict(shared.get(job_id, {}))
+    if state.get('cancel'):
+        raise JobCancelled(job_id)
+    state.update(status=RUNNING, started_at=time.time())
+    shared[job_id] = state
+    if 'job' in inspect.signature(fn).parameters:
+        kwargs = dict(kwargs, job=JobContext(job_id, shared))
+    return fn(*args, **kwargs)
+
+
+class Job:
+    """Client-side record of one submitted job"""
+
+    def __init__(self, job_id, key, label, future, info=None):
+        self.id = job_id
+        self.key = key
+        self.label = label
+        self.future = future
+        self.info = info
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+
+def job_key(name, *parts):
+    """Stable key for a job's inputs; identical inputs share one job"""
+    digest = hashlib.blake2b(name.encode(), digest_size=12)
+    for part in parts:
+        digest.update(b'\0' + repr(part).encode())
+    return digest.hexdigest()
+
+
+class JobManager:
+    """Runs heavy work off the Streamlit script thread
+
+    Jobs are deduplicated by key, so sessions asking for the same result
+    share one job and its output. Functions run in a spawned process pool
+    (or a thread pool when ``workers`` is 0) and may take a ``job``
+    argument to report progress and honour cancellation.
+    """
+
+    def __init__(self, workers=2, keep_finished=64):
+        self.keep_finished = keep_finished
+        self._jobs = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+        if workers > 0:
+            context = multiprocessing.get_context('spawn')
+            self._manager = context.Manager()
+            self._shared = self._manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        else:
+            self._manager = None
+            self._shared = {}
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, key, fn, *args, label=None, restart=False, info=None, **kwargs):
+        """Job id for ``key``, submitting ``fn(*args, **kwargs)`` if not already known
+
+        A known job is returned whatever its state; ``restart=True`` submits
+        a fresh run in place of a finished, failed or cancelled one. ``info``
+        is kept with the job and returned by ``status``.
+        """
+        with self._lock:
+            job_id = self._by_key.get(key)
+            if job_id is not None:
+                if not restart or self.status(job_id)['status'] not in (DONE, FAILED, CANCELLED):
+                    return job_id
+            job_id = uuid.uuid4().hex[:12]
+            self._shared[job_id] = {'status': PENDING, 'progress': 0.0, 'message': None}
+            future = self._executor.submit(_run_job, job_id, self._shared, fn, args, kwargs)
+            job = Job(job_id, key, label or getattr(fn, '__name__', 'job'), future, info)
+            future.add_done_callback(lambda _: setattr(job, 'finished_at', time.time()))
+            self._jobs[job_id] = job
+            self._by_key[key] = job_id
+            self._prune()
+            return job_id
+
+    def status(self, job_id):
+        """Status dict: status, progress (0..1), message, error and the submit ``info``
+
+        A job whose cancellation was requested reports CANCELLED from then
+        on, even while it is still running up to its next progress report
+        or if it finished without making one.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return {'status': FAILED, 'progress': 0.0, 'message': None, 'error': 'unknown job',
+                    'info': None}
+        state = dict(self._shared.get(job_id, {}))
+        future = job.future
+        status, error = state.get('status', PENDING), None
+        if state.get('cancel') or future.cancelled():
+            status = CANCELLED
+        elif future.done():
+            exc = future.exception()
+            if exc is None:
+                status = DONE
+            elif isinstance(exc, JobCancelled):
+                status = CANCELLED
+            else:
+                status, error = FAILED, repr(exc)
+        return {'status': status, 'progress': 1.0 if status == DONE else state.get('progress', 0.0),
+                'message': state.get('message'), 'error': error, 'info': job.info}
+
+    def result(self, job_id):
+        """Result of a finished job (raises if it failed or was cancelled)"""
+        if self._shared.get(job_id, {}).get('cancel'):
+            raise JobCancelled(job_id)
+        return self._jobs[job_id].future.result()
+
+    def cancel(self, job_id):
+        """Cancel a pending job or ask a running one to stop at its next progress report"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        if job.future.cancel():
+            return True
+        state = dict(self._shared.get(job_id, {}))
+        state['cancel'] = True
+        self._shared[job_id] = state
+        return True
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j.future.done()]
+        finished.sort(key=lambda j: j.finished_at or j.submitted_at)
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.id]
+            self._shared.pop(job.id, None)
+            if self._by_key.get(job.key) == job.id:
+                del self._by_key[job.key]
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job_id in self._jobs:
+                status = self.status(job_id)['status']
+                counts[status] = counts.get(status, 0) + 1
+            return counts
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
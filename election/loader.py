@@ -0,0 +1,186 @@
+"""
+Results File Loader
+Streams CSV / Parquet results files in validated chunks into a compact frame
+"""
+
+from collections import Counter, namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from election.generator import COLUMNS, STATUSES
+from election.schema import CATEGORICAL_COLUMNS, NUMERIC_DTYPES, STATUS_DTYPE
+
+REQUIRED_COLUMNS = ['region', 'constituency_name', 'party', 'votes', 'total_voters']
+OPTIONAL_COLUMNS = ['constituency_id', 'counting_status', 'counted_votes']
+INPUT_COLUMNS = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+LABEL_COLUMNS = ['region', 'constituency_name', 'party', 'counting_status']
+
+LoadResult = namedtuple('LoadResult', ['frame', 'report'])
+
+
+# ============================================================================
+# CHUNK READERS
+# ============================================================================
+
+def _csv_chunks(path, chunksize):
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in INPUT_COLUMNS if c in header]
+    dtype = {c: 'category' for c in LABEL_COLUMNS if c in usecols}
+    yield from pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
+
+
+def _parquet_chunks(path, chunksize):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Reading Parquet results requires pyarrow (pip install pyarrow)") from exc
+    parquet = pq.ParquetFile(path)
+    columns = [c for c in INPUT_COLUMNS if c in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+        chunk = batch.to_pandas()
+        for col in LABEL_COLUMNS:
+            if col in chunk:
+                chunk[col] = chunk[col].astype('category')
+        yield chunk
+
+
+def iter_chunks(path, chunksize=250_000):
+    """Raw chunks of a results file, dispatched on the file suffix"""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        return _parquet_chunks(path, chunksize)
+    if suffix in ('.csv', '.txt') or str(path).lower().endswith('.csv.gz'):
+        return _csv_chunks(path, chunksize)
+    raise ValueError(f"Unsupported results file format: {suffix}")
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def _clean_labels(series):
+    """Trim whitespace on category labels without expanding the column"""
+    series = series.astype('category')
+    labels, remap = np.unique(np.asarray(series.cat.categories.astype(str).str.strip(), dtype=object),
+                              return_inverse=True)
+    codes = series.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, remap[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels), index=series.index)
+
+
+def validate_chunk(chunk, rejects):
+    """Coerce one chunk to the app schema, counting rejected rows by reason"""
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk]
+    if missing:
+        raise ValueError(f"Results file is missing required columns: {', '.join(missing)}")
+
+    for col in ('region', 'constituency_name', 'party'):
+        chunk[col] = _clean_labels(chunk[col])
+    if 'counting_status' in chunk:
+        chunk['counting_status'] = _clean_labels(chunk['counting_status']).cat.add_categories(
+            [s for s in STATUSES if s not in chunk['counting_status'].cat.categories])
+        chunk['counting_status'] = chunk['counting_status'].fillna('Complete')
+    else:
+        chunk['counting_status'] = 'Complete'
+
+    for col in ('votes', 'total_voters', 'counted_votes', 'constituency_id'):
+        if col in chunk:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+    if 'counted_votes' not in chunk:
+        chunk['counted_votes'] = chunk['votes']
+    chunk['counted_votes'] = chunk['counted_votes'].fillna(chunk['votes'])
+
+    checks = [
+        ('missing_field', chunk[['region', 'constituency_name', 'party']].isna().any(axis=1)
+                          | chunk[['votes', 'total_voters']].isna().any(axis=1)),
+        ('negative_votes', (chunk['votes'] < 0) | (chunk['counted_votes'] < 0)),
+        ('counted_exceeds_votes', chunk['counted_votes'] > chunk['votes']),
+        ('unknown_status', ~chunk['counting_status'].isin(STATUSES)),
+    ]
+    bad = pd.Series(False, index=chunk.index)
+    for reason, mask in checks:
+        mask = mask & ~bad
+        rejects[reason] += int(mask.sum())
+        bad |= mask
+
+    clean = chunk[~bad.to_numpy()]
+    columns = {}
+    for col in ('region', 'constituency_name', 'party'):
+        columns[col] = clean[col].cat.remove_unused_categories()
+    columns['counting_status'] = clean['counting_status'].astype(str).astype(STATUS_DTYPE)
+    for col in ('votes', 'total_voters', 'counted_votes'):
+        columns[col] = clean[col].astype(NUMERIC_DTYPES[col])
+    if 'constituency_id' in clean:
+        columns['constituency_id'] = clean['constituency_id']
+    return pd.DataFrame(columns)
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _concat_compact(parts):
+    """Append validated chunks, unioning categories instead of widening to strings"""
+    columns = {}
+    for col in parts[0].columns:
+        if col in CATEGORICAL_COLUMNS and col != 'counting_status':
+            columns[col] = pd.Series(union_categoricals([p[col] for p in parts], ignore_order=True))
+        else:
+            columns[col] = pd.concat([p[col] for p in parts], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def _finish_frame(df):
+    """Derive ids, constituency totals and shares; return columns in schema order"""
+    if 'constituency_id' not in df or df['constituency_id'].isna().any():
+        first_seen = ~df['constituency_name'].duplicated()
+        ids = first_seen.groupby(df['region'], observed=True).cumsum()
+        df['constituency_id'] = ids.groupby(df['constituency_name'], observed=True).transform('first')
+    df['constituency_id'] = df['constituency_id'].astype(NUMERIC_DTYPES['constituency_id'])
+
+    totals = df.groupby('constituency_name', observed=True)['votes'].transform('sum')
+    df['total_constituency_votes'] = totals.astype(NUMERIC_DTYPES['total_constituency_votes'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = (df['votes'] / totals * 100).round(2)
+    df['vote_share_pct'] = share.astype(NUMERIC_DTYPES['vote_share_pct'])
+    return df[COLUMNS]
+
+
+def load_results(path, chunksize=250_000):
+    """Stream a CSV or Parquet results file into the compact election frame
+
+    Rows with missing fields, negative votes, counted_votes above votes or
+    an unknown counting status are dropped, as are repeated
+    (constituency, party) rows; the report counts each reason.
+    """
+    rejects = Counter()
+    rows_read = 0
+    parts = []
+    for chunk in iter_chunks(path, chunksize):
+        rows_read += len(chunk)
+        clean = validate_chunk(chunk, rejects)
+        if len(clean):
+            parts.append(clean)
+
+    if not parts:
+        raise ValueError(f"No valid rows in {path}")
+    df = _concat_compact(parts)
+    del parts
+
+    duplicated = df.duplicated(['constituency_name', 'party'], keep='first').to_numpy()
+    if duplicated.any():
+        rejects['duplicate'] += int(duplicated.sum())
+        df = df[~duplicated].reset_index(drop=True)
+
+    frame = _finish_frame(df)
+    report = {
+        'source': str(path),
+        'rows_read': rows_read,
+        'rows_loaded': len(frame),
+        'rows_rejected': sum(rejects.values()),
+        'rejects': {reason: n for reason, n in rejects.items() if n},
+    }
+    return LoadResult(frame, report)
@@ -0,0 +1,139 @@
+"""
+Vote Matrix
+Dense constituency x party arrays with integer-coded axes
+"""
+
+import numpy as np
+import pandas as pd
+
+from election.generator import STATUSES, COLUMNS
+from election.schema import STATUS_DTYPE, NUMERIC_DTYPES
+
+
+def factorize(series):
+    """Integer codes and labels in order of first appearance"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Factorize the small integer codes instead of the labels
+        codes, uniques = pd.factorize(series.cat.codes.to_numpy(), sort=False)
+        labels = np.asarray(series.cat.categories, dtype=object)[uniques]
+        return codes, pd.Index(labels, name=series.name)
+    codes, uniques = pd.factorize(series, sort=False)
+    return codes, pd.Index(np.asarray(uniques), name=series.name)
+
+
+def status_codes(series):
+    """Codes into STATUSES (-1 for unknown labels)"""
+    index = pd.Index(list(STATUSES))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        mapping = np.append(index.get_indexer(series.cat.categories), -1)
+        return mapping[series.cat.codes.to_numpy()]
+    return index.get_indexer(np.asarray(series, dtype=object))
+
+
+class VoteMatrix:
+    """Election results as dense constituency x party arrays
+
+    ``votes`` and ``counted`` are int64 (n_constituencies, n_parties)
+    matrices and ``status`` holds int8 codes into ``status_index`` (-1
+    where the frame has no row for that constituency and party). Each
+    constituency belongs to one region; ``region_order``/``region_starts``
+    sort constituencies by region so regional totals are a single
+    ``np.add.reduceat``. ``row_of`` maps every cell back to its frame row.
+    """
+
+    def __init__(self, constituency_index, region_index, party_index, const_region,
+                 const_electorate, const_ids, votes, counted, status, row_of=None):
+        self.constituency_index = constituency_index
+        self.region_index = region_index
+        self.party_index = party_index
+        self.status_index = pd.Index(list(STATUSES), name='counting_status')
+        self.const_region = const_region
+        self.const_electorate = const_electorate
+        self.const_ids = const_ids
+        self.votes = votes
+        self.counted = counted
+        self.status = status
+        self.row_of = row_of
+
+        self.region_order = np.argsort(const_region, kind='stable')
+        self.region_starts = np.searchsorted(const_region[self.region_order],
+                                             np.arange(len(region_index)))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build from a long election frame (one row per constituency and party)"""
+        region_codes, region_index = factorize(df['region'])
+        const_codes, constituency_index = factorize(df['constituency_name'])
+        party_codes, party_index = factorize(df['party'])
+        n_const, n_party = len(constituency_index), len(party_index)
+        cells = const_codes.astype(np.int64) * n_party + party_codes
+        size = n_const * n_party
+
+        def dense(values, dtype=np.int64):
+            return np.bincount(cells, weights=values, minlength=size).astype(dtype).reshape(n_const, n_party)
+
+        const_region = np.zeros(n_const, dtype=np.int64)
+        const_region[const_codes] = region_codes
+        const_electorate = np.zeros(n_const, dtype=np.int64)
+        const_electorate[const_codes] = df['total_voters'].to_numpy(dtype=np.int64)
+        const_ids = np.arange(1, n_const + 1, dtype=np.int64)
+        if 'constituency_id' in df:
+            const_ids[const_codes] = df['constituency_id'].to_numpy(dtype=np.int64)
+
+        status = np.full(size, -1, dtype=np.int8)
+        status[cells] = status_codes(df['counting_status'])
+        row_of = np.full(size, -1, dtype=np.int64)
+        row_of[cells] = np.arange(len(df))
+
+        return cls(constituency_index, region_index, party_index, const_region, const_electorate,
+                   const_ids, dense(df['votes'].to_numpy(dtype=np.float64)),
+                   dense(df['counted_votes'].to_numpy(dtype=np.float64)),
+                   status.reshape(n_const, n_party), row_of.reshape(n_const, n_party))
+
+    def to_frame(self):
+        """Long compact frame of the present cells in constituency, party order"""
+        const, party = np.nonzero(self.status >= 0)
+        totals = self.votes.sum(axis=1)
+        votes = self.votes[const, party]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = np.round(votes / totals[const] * 100, 2)
+        frame = pd.DataFrame({
+            'region': pd.Categorical.from_codes(self.const_region[const], self.region_index),
+            'constituency_id': self.const_ids[const].astype(NUMERIC_DTYPES['constituency_id']),
+            'constituency_name': pd.Categorical.from_codes(const, self.constituency_index),
+            'total_voters': self.const_electorate[const].astype(NUMERIC_DTYPES['total_voters']),
+            'party': pd.Categorical.from_codes(party, self.party_index),
+            'votes': votes.astype(NUMERIC_DTYPES['votes']),
+            'counting_status': pd.Categorical.from_codes(self.status[const, party],
+                                                         dtype=STATUS_DTYPE),
+            'counted_votes': self.counted[const, party].astype(NUMERIC_DTYPES['counted_votes']),
+            'total_constituency_votes': totals[const].astype(NUMERIC_DTYPES['total_constituency_votes']),
+            'vote_share_pct': share.astype(NUMERIC_DTYPES['vote_share_pct']),
+        })
+        return frame[COLUMNS]
+
+    # ------------------------------------------------------------------
+    # Axis reductions
+    # ------------------------------------------------------------------
+
+    @property
+    def shape(self):
+        return self.votes.shape
+
+    def region_sums(self, matrix):
+        """Sum a per-constituency array (1-D or 2-D) into per-region rows"""
+        if len(self.region_order) == 0:
+            return np.zeros((len(self.region_index),) + matrix.shape[1:], dtype=matrix.dtype)
+        return np.add.reduceat(matrix[self.region_order], self.region_starts, axis=0)
+
+    def status_counts(self):
+        """Constituency x status counts of present cells"""
+        counts = np.zeros((self.shape[0], len(self.status_index)), dtype=np.int64)
+        for code in range(len(self.status_index)):
+            counts[:, code] = (self.status == code).sum(axis=1)
+        return counts
+
+    def shares(self):
+        """Within-constituency vote shares (%)"""
+        totals = self.votes.sum(axis=1, keepdims=True)
+        return np.divide(self.votes * 100.0, totals, out=np.zeros(self.shape), where=totals > 0)
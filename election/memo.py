@@ -0,0 +1,42 @@
+"""
+Memo
+Lock-guarded cache of derived views over data that live updates mutate
+"""
+
+import threading
+
+_MISSING = object()
+
+
+class Memo:
+    """Views keyed by name, built at most once between data changes
+
+    Builds and stores happen under ``lock``. Writers that change the
+    underlying arrays hold the same lock while they update and call
+    ``clear``, so a build never interleaves with an update and a cleared
+    memo is never refilled from half-updated data. Readers always get
+    the value they built or found, never a lookup that a concurrent
+    ``clear`` emptied.
+    """
+
+    def __init__(self, lock=None):
+        self.lock = lock if lock is not None else threading.RLock()
+        self._values = {}
+
+    def get(self, key, build):
+        """Memoized ``build()`` for ``key``"""
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            with self.lock:
+                value = self._values.get(key, _MISSING)
+                if value is _MISSING:
+                    value = self._values[key] = build()
+        return value
+
+    def pop(self, key):
+        with self.lock:
+            self._values.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self._values.clear()
@@ -0,0 +1,124 @@
+"""
+Page Data
+The tables and figures' inputs each page renders, shared by the app and the benchmarks
+"""
+
+from election.anomalies import AnomalyDetector
+from election.charts import box_stats, histogram_bins
+from election.constituencies import ConstituencyTable
+from election.filters import FilterIndex
+from election.table import SortIndex
+from election.timeline import TimelineStore
+from election.winners import WinnersTable
+
+STATUS_LABELS = (("✅ Complete", 'Complete'), ("⏳ In Progress", 'In Progress'), ("⏰ Pending", 'Pending'))
+
+
+# ============================================================================
+# DERIVED OBJECTS
+# ============================================================================
+
+def filter_index(entry):
+    """Row-position index for region/party/status filters"""
+    return entry.derived('filter_index', FilterIndex)
+
+
+def sort_index(entry):
+    """Precomputed row orders for paginated tables"""
+    return entry.derived('sort_index', SortIndex)
+
+
+def winners(entry):
+    """Per-constituency winners and margins, kept current by live updates"""
+    return entry.derived('winners', lambda _: WinnersTable(entry.aggregates))
+
+
+def constituencies(entry):
+    """Constituency dimension table (electorate, status, turnout)"""
+    return entry.derived('constituencies', lambda _: ConstituencyTable(entry.aggregates))
+
+
+def timeline(entry):
+    """Counting history of the dataset since it was loaded"""
+    return entry.derived('timeline', lambda _: TimelineStore(entry.aggregates))
+
+
+def anomalies(entry):
+    """Anomaly scores for the dataset, re-scored on live updates"""
+    return entry.derived('anomalies', lambda _: AnomalyDetector(entry.aggregates,
+                                                                over_count=entry.over_count))
+
+
+# ============================================================================
+# PAGES
+# ============================================================================
+
+def home_data(entry):
+    """Headline metrics, party/region totals, seat tally and turnout"""
+    cube, table, turnout = entry.aggregates, winners(entry), constituencies(entry)
+    return {
+        'total_votes': cube.total_votes,
+        'n_constituencies': cube.n_constituencies,
+        'turnout_pct': turnout.turnout_pct,
+        'leading_party': cube.leading_party,
+        'party_distribution': cube.party_distribution(),
+        'region_votes': cube.region_votes.reset_index(),
+        'majority': table.majority,
+        'seat_tally': table.seat_tally(),
+        'margin_categories': table.frame()['margin_category'].value_counts(sort=False),
+        'region_turnout': turnout.region_turnout(),
+        'turnout_categories': turnout.category_counts(),
+    }
+
+
+def voting_data(entry, region=None, party=None):
+    """Filtered rows, vote distribution and top constituencies"""
+    cube = entry.aggregates
+    return {
+        'rows': filter_index(entry).view(region=region, party=party).rows,
+        'party_distribution': cube.party_distribution(region, party),
+        'top_constituencies': cube.top_constituencies(region, party),
+    }
+
+
+def counting_data(entry, resolution='minute', by='party', closest=10):
+    """Status counts, counting progress and the closest races"""
+    cube = entry.aggregates
+    return {
+        'status': [(label, cube.status_count(status)) for label, status in STATUS_LABELS],
+        'region_status': cube.region_status_frame(),
+        'party_counted': cube.party_counted.reset_index(),
+        'progress': timeline(entry).progress(resolution, by),
+        'closest': winners(entry).closest(closest),
+    }
+
+
+def module1_data(entry):
+    """Descriptive statistics and vote shares"""
+    cube = entry.aggregates
+    shares = cube.party_distribution()
+    return {
+        'stats': cube.party_stats[['total_votes', 'mean_votes', 'median_votes',
+                                   'std_votes', 'min_votes', 'max_votes']].reset_index(),
+        'vote_share': shares.assign(percentage=(shares['votes'] / shares['votes'].sum() * 100).round(2)),
+    }
+
+
+# Raw-row summaries behind the module 1 charts, only needed on a figure cache miss
+
+def vote_box(entry):
+    return box_stats(entry.frame, 'party', 'votes')
+
+
+def vote_share_bins(entry):
+    return histogram_bins(entry.frame['vote_share_pct'], bins=50, value_range=(0, 100))
+
+
+def module2_data(entry, regions):
+    """Region x party comparison, region summary and per-party regional stats"""
+    cube = entry.aggregates
+    return {
+        'comparison': cube.regional_slice(regions),
+        'summary': cube.region_summary(regions),
+        'party_stats': cube.region_party_stats(regions),
+    }
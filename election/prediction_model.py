@@ -0,0 +1,234 @@
+"""
+Prediction Models
+Winner prediction models behind the Winner Prediction model selector
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from election.aggregates import predict_inputs
+
+
+def predict_winner_ensemble(cube):
+    """Ensemble prediction"""
+    party_stats = predict_inputs(cube)
+    
+    # Weighted scoring
+    party_stats['score'] = (
+        party_stats['total_votes'] * 0.5 +
+        party_stats['count'] * 1000 * 0.3 +
+        party_stats['avg_share'] * 100 * 0.2
+    )
+    
+    party_stats['win_probability'] = (party_stats['score'] / party_stats['score'].sum() * 100).round(2)
+    party_stats['predicted_votes'] = (party_stats['total_votes'] * 1.05).astype(int)
+    
+    return party_stats.sort_values('win_probability', ascending=False)
+
+
+# ============================================================================
+# SHARED HELPERS
+# ============================================================================
+
+def seat_outcomes(mu, sigma, draws=2000, seed=0, chunk_cells=4_000_000, job=None):
+    """Expected seats and P(most seats) per party from cell-level normal forecasts
+
+    ``mu`` and ``sigma`` are constituency x party matrices of predicted
+    final votes and their standard deviation. A background ``job`` gets a
+    progress report (and a chance to stop) after every chunk of draws.
+    """
+    rng = np.random.default_rng(seed)
+    n_const, n_parties = mu.shape
+    seats = np.zeros((draws, n_parties), dtype=np.int32)
+    chunk = max(1, chunk_cells // (n_const * n_parties))
+    for start in range(0, draws, chunk):
+        d = min(chunk, draws - start)
+        sample = mu + sigma * rng.standard_normal((d, n_const, n_parties))
+        winners = sample.argmax(axis=2) + np.arange(d)[:, None] * n_parties
+        seats[start:start + d] = np.bincount(winners.ravel(), minlength=d * n_parties).reshape(d, n_parties)
+        if job is not None:
+            job.progress(0.5 + 0.5 * (start + d) / draws, f"{start + d:,} / {draws:,} seat draws")
+    leaders = seats == seats.max(axis=1, keepdims=True)
+    win = (leaders / leaders.sum(axis=1, keepdims=True)).mean(axis=0)
+    return seats.mean(axis=0), win
+
+
+def row_codes(frame, cube):
+    """Constituency and party codes of every frame row on the cube's axes"""
+    const_codes = cube.constituency_index.get_indexer(np.asarray(frame['constituency_name'], dtype=object))
+    party_codes = cube.party_index.get_indexer(np.asarray(frame['party'], dtype=object))
+    return const_codes, party_codes
+
+
+class VoteModel:
+    """Base class: fit once per dataset, summarise at any confidence level
+
+    Subclasses set ``self.mu`` and ``self.sigma``, constituency x party
+    matrices of predicted final votes and their standard deviation. A
+    background ``job`` is checked for cancellation between the fit and
+    the seat simulation.
+    """
+
+    name = None
+
+    def __init__(self, frame, cube, job=None):
+        self.parties = cube.party_index
+        self.mu = None
+        self.sigma = None
+        if job is not None:
+            job.progress(0.0, "Fitting")
+        self.fit(frame, cube)
+        if job is not None:
+            job.progress(0.5, "Simulating seat outcomes")
+        self.expected_seats, self.win = seat_outcomes(self.mu, self.sigma, job=job)
+
+    def fit(self, frame, cube):
+        raise NotImplementedError
+
+    def predict(self, confidence=0.95):
+        """Party-level predictions sorted by win probability"""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        total = self.mu.sum(axis=0)
+        spread = np.sqrt((self.sigma ** 2).sum(axis=0))
+        predictions = pd.DataFrame({
+            'party': self.parties,
+            'predicted_votes': total.round().astype(np.int64),
+            'lower_ci': np.maximum(total - z * spread, 0).round().astype(np.int64),
+            'upper_ci': (total + z * spread).round().astype(np.int64),
+            'expected_seats': self.expected_seats.round(2),
+            'win_probability': (self.win * 100).round(2),
+        })
+        return predictions.sort_values(['win_probability', 'predicted_votes'],
+                                       ascending=False, ignore_index=True)
+
+
+class RegressionModel(VoteModel):
+    """Predicts final votes of uncounted rows from count-time features
+
+    Rows with a 'Complete' status are the training set and keep their
+    reported votes; every other row gets the model's prediction.
+    """
+
+    def features(self, frame, cube, const_codes, party_codes):
+        counted = frame['counted_votes'].to_numpy(dtype=np.float64)
+        const_counted = cube.const_party_counted.sum(axis=1)[const_codes]
+        region_codes = cube.const_region[const_codes]
+        columns = [
+            np.ones(len(frame)),
+            counted,
+            counted / np.maximum(const_counted, 1),
+            const_counted,
+            frame['total_voters'].to_numpy(dtype=np.float64),
+        ]
+        columns += [(party_codes == p).astype(np.float64) for p in range(1, len(cube.party_index))]
+        columns += [(region_codes == r).astype(np.float64) for r in range(1, len(cube.region_index))]
+        return np.column_stack(columns)
+
+    def fit(self, frame, cube):
+        const_codes, party_codes = row_codes(frame, cube)
+        X = self.features(frame, cube, const_codes, party_codes)
+        y = frame['votes'].to_numpy(dtype=np.float64)
+        complete = (np.asarray(frame['counting_status'], dtype=object) == 'Complete')
+        train = complete if complete.sum() > X.shape[1] else np.ones(len(y), dtype=bool)
+
+        mean, sd = self.fit_predict(X[train], y[train], X[~complete])
+        pred = y.copy()
+        spread = np.zeros(len(y))
+        pred[~complete] = np.maximum(mean, frame['counted_votes'].to_numpy()[~complete])
+        spread[~complete] = sd
+
+        shape = (len(cube.constituency_index), len(cube.party_index))
+        self.mu = np.zeros(shape)
+        self.sigma = np.zeros(shape)
+        self.mu[const_codes, party_codes] = pred
+        self.sigma[const_codes, party_codes] = spread
+
+
+class LinearRegressionModel(RegressionModel):
+    """Ordinary least squares on count-time features"""
+
+    name = 'Linear Regression'
+
+    def fit_predict(self, X_train, y_train, X_new):
+        coef, *_ = np.linalg.lstsq(X_train, y_train, rcond=None)
+        residuals = y_train - X_train @ coef
+        dof = max(len(y_train) - X_train.shape[1], 1)
+        self.coefficients = coef
+        return X_new @ coef, np.sqrt(residuals @ residuals / dof)
+
+
+class RandomForestModel(RegressionModel):
+    """Random forest regression; spread across trees gives the uncertainty"""
+
+    name = 'Random Forest'
+    max_training_rows = 50_000
+
+    def fit_predict(self, X_train, y_train, X_new):
+        from sklearn.ensemble import RandomForestRegressor
+
+        forest = RandomForestRegressor(
+            n_estimators=60, min_samples_leaf=5, n_jobs=-1, random_state=42,
+            max_samples=min(1.0, self.max_training_rows / len(y_train)),
+        )
+        forest.fit(X_train, y_train)
+        if not len(X_new):
+            return np.zeros(0), np.zeros(0)
+        per_tree = np.stack([tree.predict(X_new) for tree in forest.estimators_])
+        return per_tree.mean(axis=0), per_tree.std(axis=0)
+
+
+class BayesianModel(VoteModel):
+    """Conjugate Dirichlet-multinomial update per constituency
+
+    Prior party shares are the national counted shares scaled by
+    ``concentration``; each constituency's counted votes update them to a
+    Dirichlet posterior, and the uncounted votes (votes - counted_votes)
+    follow the Dirichlet-multinomial predictive, whose mean and variance
+    are closed-form.
+    """
+
+    name = 'Bayesian'
+    concentration = 50.0
+
+    def fit(self, frame, cube):
+        counted = cube.const_party_counted.astype(np.float64)
+        remaining = np.maximum(cube.const_party_votes - cube.const_party_counted, 0).sum(axis=1)
+        national = counted.sum(axis=0)
+        prior = self.concentration * national / max(national.sum(), 1)
+
+        alpha = prior + counted
+        total = alpha.sum(axis=1, keepdims=True)
+        share = alpha / total
+        r = remaining[:, None].astype(np.float64)
+        self.posterior_alpha = alpha
+        self.mu = counted + r * share
+        self.sigma = np.sqrt(r * share * (1 - share) * (r + total) / (1 + total))
+
+
+class EnsembleModel:
+    """The portal's original weighted-score ensemble"""
+
+    name = 'Ensemble'
+
+    def __init__(self, frame, cube, job=None):
+        if job is not None:
+            job.progress(0.0, "Scoring")
+        self.predictions = predict_winner_ensemble(cube)
+
+    def predict(self, confidence=0.95):
+        return self.predictions
+
+
+MODELS = {
+    model.name: model
+    for model in (EnsembleModel, LinearRegressionModel, RandomForestModel, BayesianModel)
+}
+
+
+def fit_model(name, frame, cube, job=None):
+    """Fit the named model on a frame and its aggregate cube (cancellable as a background job)"""
+    if name not in MODELS:
+        raise ValueError(f"Unknown prediction model: {name}")
+    return MODELS[name](frame, cube, job=job)
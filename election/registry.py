@@ -0,0 +1,206 @@
+"""
+Dataset Registry
+Process-wide store of immutable election frames shared by every session
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from election.aggregates import AggregateCube, dataset_fingerprint
+from election.ingest import CountIngestor
+
+
+class DatasetEntry:
+    """One published dataset version and the objects derived from it"""
+
+    def __init__(self, version, frame, fingerprint, source=None):
+        self.version = version
+        self.frame = frame
+        self.fingerprint = fingerprint
+        self.source = source
+        self.created_at = time.time()
+        self.holders = set()
+        self.revision = 0
+        self._over_count = None
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    def derived(self, name, builder):
+        """Build a derived object (aggregates, indexes, models) once per version
+
+        The lookup and build run under the entry lock, which ``apply_counts``
+        holds while it updates or drops derived objects.
+        """
+        with self._lock:
+            obj = self._derived.get(name)
+            if obj is None:
+                obj = self._derived[name] = builder(self.frame)
+            return obj
+
+    @property
+    def aggregates(self):
+        return self.derived('aggregates', AggregateCube)
+
+    @property
+    def over_count(self):
+        """Constituency x party votes counted beyond the projected total so far
+
+        Ingestion raises ``votes`` to cover an over-count, so this is the
+        only record of it once a batch is applied.
+        """
+        with self._lock:
+            if self._over_count is None:
+                self._over_count = np.zeros(self.aggregates.matrix.shape, dtype=np.int64)
+            return self._over_count
+
+    @property
+    def key(self):
+        """(version, revision) pair identifying the current contents"""
+        return (self.version, self.revision)
+
+    def apply_counts(self, updates):
+        """Apply a batch of live count deltas in place and bump the revision
+
+        The aggregate cube is maintained by the ingestor; other derived
+        objects are updated through their own ``apply_deltas`` when they
+        have one and are dropped (rebuilt on next use) otherwise. The cube's
+        lock is held throughout, so views memoized over the cube are never
+        built from a half-applied batch.
+        """
+        with self._lock:
+            cube = self.aggregates
+            ingestor = self.derived('ingestor', lambda frame: CountIngestor(frame, cube))
+            with cube.lock:
+                delta, summary = ingestor.apply_batch(updates)
+                np.add.at(self.over_count, (delta.const_codes, delta.party_codes), delta.over_count)
+                summary['over_counted'] = int((delta.over_count > 0).sum())
+                for name, obj in list(self._derived.items()):
+                    if name in ('aggregates', 'ingestor'):
+                        continue
+                    if hasattr(obj, 'apply_deltas'):
+                        obj.apply_deltas(delta)
+                    else:
+                        del self._derived[name]
+                self.revision += 1
+            summary['revision'] = self.revision
+            return summary
+
+    @property
+    def refcount(self):
+        return len(self.holders)
+
+
+class DatasetRegistry:
+    """Versioned, reference-counted registry of read-only election frames
+
+    Sessions keep only a version id. A version stays resident while any
+    session holds it or while it is the latest version; released versions
+    are dropped together with their derived objects. Sessions that end
+    without releasing (a closed tab) are dropped by ``sweep``.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._by_fingerprint = {}
+        self._by_source = {}
+        self._next_version = 1
+        self._latest = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, frame, source=None, fingerprint=None):
+        """Register a frame and return its version id (deduplicated by content)"""
+        fingerprint = fingerprint or dataset_fingerprint(frame)
+        with self._lock:
+            if fingerprint in self._by_fingerprint:
+                version = self._by_fingerprint[fingerprint]
+            else:
+                version = self._next_version
+                self._next_version += 1
+                self._entries[version] = DatasetEntry(version, frame, fingerprint, source)
+                self._by_fingerprint[fingerprint] = version
+            if source is not None:
+                self._by_source[source] = version
+            previous, self._latest = self._latest, version
+            self._evict(previous)
+            return version
+
+    def load(self, source, builder):
+        """Version for a source key, building and publishing it on first use"""
+        with self._lock:
+            version = self._by_source.get(source)
+            if version in self._entries:
+                return version
+            return self.publish(builder(), source=source)
+
+    # ------------------------------------------------------------------
+    # Access and reference counting
+    # ------------------------------------------------------------------
+
+    def get(self, version):
+        with self._lock:
+            return self._entries[version]
+
+    def __contains__(self, version):
+        return version in self._entries
+
+    @property
+    def latest(self):
+        return self._latest
+
+    def acquire(self, version, holder):
+        """Mark a session as using a version (idempotent per holder)"""
+        with self._lock:
+            self._entries[version].holders.add(holder)
+
+    def release(self, version, holder):
+        """Drop a session's hold on a version and evict it if unused"""
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None:
+                return
+            entry.holders.discard(holder)
+            self._evict(version)
+
+    def sweep(self, alive):
+        """Drop holders for which ``alive(holder)`` is false and evict what only they held
+
+        Returns the number of holds dropped.
+        """
+        with self._lock:
+            dropped = 0
+            for version, entry in list(self._entries.items()):
+                dead = {holder for holder in entry.holders if not alive(holder)}
+                if dead:
+                    entry.holders -= dead
+                    dropped += len(dead)
+                    self._evict(version)
+            return dropped
+
+    def _evict(self, version):
+        entry = self._entries.get(version)
+        if entry is None or entry.refcount or version == self._latest:
+            return
+        del self._entries[version]
+        self._by_fingerprint.pop(entry.fingerprint, None)
+        for source in [s for s, v in self._by_source.items() if v == version]:
+            del self._by_source[source]
+
+    def stats(self):
+        """Resident versions with their holders and derived objects"""
+        with self._lock:
+            return [{
+                'version': e.version,
+                'revision': e.revision,
+                'fingerprint': e.fingerprint,
+                'source': e.source,
+                'rows': len(e.frame),
+                'sessions': e.refcount,
+                'derived': sorted(e._derived),
+                'latest': e.version == self._latest,
+            } for e in self._entries.values()]
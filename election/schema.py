@@ -0,0 +1,67 @@
+"""
+Election Frame Schema
+Compact categorical / downcast dtypes and memory reporting
+"""
+
+import numpy as np
+import pandas as pd
+
+from election.generator import STATUSES
+
+CATEGORICAL_COLUMNS = ['region', 'constituency_name', 'party', 'counting_status']
+
+NUMERIC_DTYPES = {
+    'constituency_id': np.int32,
+    'total_voters': np.int32,
+    'votes': np.int32,
+    'counted_votes': np.int32,
+    'total_constituency_votes': np.int32,
+    'vote_share_pct': np.float32,
+}
+
+STATUS_DTYPE = pd.CategoricalDtype(list(STATUSES))
+
+
+def compact_frame(df):
+    """Convert an election frame to categorical labels and 32-bit numerics
+
+    Aggregations over the compact frame must pass ``observed=True`` so that
+    unused categories do not introduce empty groups.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col == 'counting_status':
+            columns[col] = series.astype(STATUS_DTYPE)
+        elif col in CATEGORICAL_COLUMNS:
+            columns[col] = series.astype('category')
+        elif col in NUMERIC_DTYPES:
+            columns[col] = series.astype(NUMERIC_DTYPES[col])
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def is_compact(df):
+    """True when every known column already has its compact dtype"""
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            return False
+        if col in NUMERIC_DTYPES and df[col].dtype != NUMERIC_DTYPES[col]:
+            return False
+    return True
+
+
+def memory_report(df, baseline=None):
+    """Per-column dtype and deep memory usage, optionally against a baseline frame"""
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': df.memory_usage(deep=True, index=False),
+    })
+    report.loc['TOTAL'] = ['', report['bytes'].sum()]
+    if baseline is not None:
+        baseline_bytes = baseline.memory_usage(deep=True, index=False)
+        report['baseline_bytes'] = baseline_bytes.reindex(report.index)
+        report.loc['TOTAL', 'baseline_bytes'] = baseline_bytes.sum()
+        report['saving_pct'] = ((1 - report['bytes'] / report['baseline_bytes']) * 100).round(1)
+    return report
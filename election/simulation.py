@@ -0,0 +1,177 @@
+"""
+Monte Carlo Seat Projection
+Simulates the uncounted vote in every constituency to project seat outcomes
+"""
+
+import numpy as np
+import pandas as pd
+
+# Upper bound on the float32 working tensor (draws x constituencies x parties)
+CHUNK_BYTES = 32 * 1024 * 1024
+
+
+class SeatProjection:
+    """Seat draws from a Monte Carlo run plus summaries at any confidence level"""
+
+    def __init__(self, parties, seats, constituency_wins, n_constituencies, decided):
+        self.parties = pd.Index(parties, name='party')
+        self.seats = seats
+        self.constituency_wins = constituency_wins
+        self.n_constituencies = n_constituencies
+        self.decided = decided
+
+    @property
+    def draws(self):
+        return len(self.seats)
+
+    @property
+    def majority(self):
+        return self.n_constituencies // 2 + 1
+
+    def summary(self, confidence=0.95):
+        """Per-party expected seats, interval, win and majority probabilities"""
+        alpha = (1 - confidence) / 2
+        lower, median, upper = np.quantile(self.seats, [alpha, 0.5, 1 - alpha], axis=0)
+        most = self.seats.max(axis=1, keepdims=True)
+        leaders = self.seats == most
+        # Tied first places share the win
+        win = (leaders / leaders.sum(axis=1, keepdims=True)).mean(axis=0)
+        return pd.DataFrame({
+            'party': self.parties,
+            'expected_seats': self.seats.mean(axis=0).round(2),
+            'median_seats': median,
+            'seats_lower': lower,
+            'seats_upper': upper,
+            'win_probability': (win * 100).round(2),
+            'majority_probability': ((self.seats >= self.majority).mean(axis=0) * 100).round(2),
+        }).sort_values('expected_seats', ascending=False, ignore_index=True)
+
+    def seat_distribution(self):
+        """Long frame of (party, seats, probability) over all draws"""
+        n_parties = len(self.parties)
+        counts = np.zeros((n_parties, self.n_constituencies + 1), dtype=np.int64)
+        for p in range(n_parties):
+            counts[p] = np.bincount(self.seats[:, p], minlength=self.n_constituencies + 1)
+        dist = pd.DataFrame(counts / self.draws, index=self.parties).stack().rename('probability')
+        dist.index.names = ['party', 'seats']
+        dist = dist.reset_index()
+        return dist[dist['probability'] > 0].reset_index(drop=True)
+
+    def constituency_probabilities(self, constituencies):
+        """Constituency x party win probabilities"""
+        return pd.DataFrame(self.constituency_wins / self.draws,
+                            index=pd.Index(constituencies, name='constituency_name'),
+                            columns=self.parties)
+
+
+def simulate_seats(counted, votes, draws=100_000, constituency_sd=0.10, national_sd=0.03,
+                   seed=None, job=None):
+    """Project seats from constituency x party counted and projected vote matrices
+
+    The uncounted votes (votes - counted) of each constituency are shared
+    out with the projected party shares perturbed on the log scale by a
+    per-constituency error (``constituency_sd``) and a per-draw national
+    swing common to all constituencies (``national_sd``).
+
+    Work is kept proportional to the contested part of the map:
+    constituencies whose leader is ahead by more than the remaining vote
+    are settled without simulation, and within the rest only parties that
+    could still overtake the leader are simulated (the others keep their
+    expected share of the remaining vote). Draws are generated in
+    antithetic pairs and in chunks that keep the working tensor within
+    CHUNK_BYTES. When run as a background job, progress is reported
+    after every chunk.
+    """
+    rng = np.random.default_rng(seed)
+    counted = np.asarray(counted, dtype=np.float64)
+    remaining = np.maximum(np.asarray(votes, dtype=np.float64) - counted, 0)
+    n_const, n_parties = counted.shape
+    rem_total = remaining.sum(axis=1)
+
+    # Constituencies the uncounted vote cannot overturn
+    leader = counted.argmax(axis=1)
+    top = counted[np.arange(n_const), leader]
+    runner_up = np.sort(counted, axis=1)[:, -2] if n_parties > 1 else np.zeros(n_const)
+    decided = (top - runner_up) > rem_total
+
+    seats = np.zeros((draws, n_parties), dtype=np.int32)
+    seats += np.bincount(leader[decided], minlength=n_parties).astype(np.int32)
+    constituency_wins = np.zeros((n_const, n_parties), dtype=np.int64)
+    constituency_wins[decided, leader[decided]] = draws
+
+    open_idx = np.flatnonzero(~decided)
+    if len(open_idx):
+        o_counted, o_remaining = counted[open_idx], remaining[open_idx]
+        o_total = rem_total[open_idx]
+        # Expected split of the remaining vote (counted shares when nothing is left)
+        shares = np.where(o_remaining.sum(axis=1, keepdims=True) > 0, o_remaining, o_counted + 1)
+        shares = shares / shares.sum(axis=1, keepdims=True)
+
+        # Contenders: parties that could still reach the leader's counted total
+        contender = o_counted + o_total[:, None] >= top[open_idx, None]
+        k = int(contender.sum(axis=1).max())
+        rank = np.argsort(~contender, axis=1, kind='stable')[:, :k]
+        valid = np.take_along_axis(contender, rank, axis=1)
+        c_counted = np.where(valid, np.take_along_axis(o_counted, rank, axis=1), -np.inf)
+        c_share = np.where(valid, np.take_along_axis(shares, rank, axis=1), 0)
+        pool = o_total * c_share.sum(axis=1)
+        with np.errstate(divide='ignore'):
+            log_share = np.log(c_share / np.maximum(c_share.sum(axis=1, keepdims=True), 1e-12))
+
+        # Party-major float32 layout: (k, draws, constituencies)
+        log_share = log_share.T[:, None, :].astype(np.float32)
+        c_counted = c_counted.T[:, None, :].astype(np.float32)
+        pool = pool.astype(np.float32)
+
+        n_open = len(open_idx)
+        chunk = max(2, CHUNK_BYTES // (n_open * k * 4)) // 2 * 2
+        wins = np.zeros((n_open, k), dtype=np.int64)
+        for start in range(0, draws, chunk):
+            d = min(chunk, draws - start)
+            half = (d + 1) // 2
+            # Antithetic pairs: the second half of the chunk reuses -z
+            weights = np.empty((2, k, half, n_open), dtype=np.float32)
+            z = weights[0]
+            rng.standard_normal(dtype=np.float32, out=z)
+            z *= constituency_sd
+            # The national swing belongs to a party, so it is drawn per party and
+            # gathered into each constituency's contender slots
+            swing = rng.standard_normal((n_parties, half), dtype=np.float32)
+            swing *= national_sd
+            z += swing[rank.T].swapaxes(1, 2)
+            np.negative(z, out=weights[1])
+            weights += log_share
+            np.exp(weights, out=weights)
+            scale = pool / np.maximum(weights.sum(axis=1), np.float32(1e-30))
+            for j in range(k):
+                weights[:, j] *= scale
+            weights += c_counted
+
+            best = weights[:, 0].copy()
+            winners = np.zeros(best.shape, dtype=np.intp)
+            for j in range(1, k):
+                ahead = weights[:, j] > best
+                np.copyto(winners, j, where=ahead)
+                np.maximum(best, weights[:, j], out=best)
+            winners = winners.reshape(2 * half, n_open)[:d]
+
+            flat = rank[np.arange(n_open), winners] + (np.arange(d)[:, None] * n_parties)
+            seats[start:start + d] += np.bincount(
+                flat.ravel(), minlength=d * n_parties).reshape(d, n_parties).astype(np.int32)
+            flat = winners + np.arange(n_open) * k
+            wins += np.bincount(flat.ravel(), minlength=n_open * k).reshape(n_open, k)
+            if job is not None:
+                job.progress((start + d) / draws, f"{start + d:,} / {draws:,} draws")
+
+        np.add.at(constituency_wins, (np.repeat(open_idx, k), rank.ravel()), wins.ravel())
+
+    return SeatProjection(np.arange(n_parties), seats, constituency_wins, n_const, int(decided.sum()))
+
+
+def project_seats(cube, draws=100_000, constituency_sd=0.10, national_sd=0.03, seed=None,
+                  job=None):
+    """Seat projection for the current state of an AggregateCube"""
+    projection = simulate_seats(cube.const_party_counted, cube.const_party_votes, draws,
+                                constituency_sd, national_sd, seed, job)
+    projection.parties = pd.Index(cube.party_index, name='party')
+    return projection
@@ -0,0 +1,100 @@
+"""
+Snapshot Cache
+Arrow IPC snapshots of prepared election frames for fast cold starts
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Bump when the prepared frame layout changes so old snapshots are ignored
+SNAPSHOT_FORMAT = 1
+
+
+def source_key(*parts):
+    """Short hash identifying the inputs a snapshot was built from"""
+    digest = hashlib.blake2b(digest_size=10)
+    digest.update(f"format={SNAPSHOT_FORMAT}".encode())
+    for part in parts:
+        digest.update(b'\0' + repr(part).encode())
+    return digest.hexdigest()
+
+
+def file_source_key(path):
+    """Source key for a results file: resolved path, size and modification time"""
+    stat = os.stat(path)
+    return source_key(str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+class SnapshotCache:
+    """Directory of Arrow IPC snapshots keyed by name and source hash
+
+    Snapshots are written uncompressed so later processes can memory-map
+    them: numeric columns are served straight from the page cache and only
+    the dictionary-encoded label columns are materialised.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def path(self, name, key):
+        return self.directory / f"{name}-{key}.arrow"
+
+    def load(self, name, key):
+        """(frame, metadata) from a snapshot, or None when absent or unreadable"""
+        import pyarrow as pa
+
+        path = self.path(name, key)
+        if not path.exists():
+            return None
+        try:
+            table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+        except (OSError, pa.ArrowInvalid):
+            return None
+        metadata = json.loads((table.schema.metadata or {}).get(b'election', b'{}'))
+        return table.to_pandas(split_blocks=True), metadata
+
+    def save(self, name, key, frame, metadata=None):
+        """Write a snapshot atomically and drop older snapshots of the same name"""
+        import pyarrow as pa
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'election': json.dumps(metadata or {}).encode(),
+        })
+        path = self.path(name, key)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        with pa.OSFile(str(tmp), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+        for stale in self.directory.glob(f"{name}-*.arrow"):
+            # Keys are hex digests, so 'results-<key>' never matches another
+            # name sharing the prefix such as 'results-previous-<key>'
+            if stale != path and '-' not in stale.stem[len(name) + 1:]:
+                stale.unlink(missing_ok=True)
+        return path
+
+    def load_or_build(self, name, key, builder):
+        """Return (frame, metadata) from the snapshot, building and saving it on a miss
+
+        ``builder`` returns a (frame, metadata) pair. Without pyarrow the
+        cache is bypassed and the builder result returned as is.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return builder()
+
+        cached = self.load(name, key)
+        if cached is not None:
+            return cached
+        frame, metadata = builder()
+        try:
+            self.save(name, key, frame, metadata)
+        except OSError:
+            pass
+        return frame, metadata
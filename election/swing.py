@@ -0,0 +1,203 @@
+"""
+Swing Analysis
+Constituency/party alignment with a previous election and uniform-swing projection
+"""
+
+import numpy as np
+import pandas as pd
+
+from election.memo import Memo
+
+SWING_BINS = (-5, 0, 5)
+SWING_DIRECTIONS = ('Strong Loss', 'Loss', 'Gain', 'Strong Gain')
+
+EXACT, RENAMED, NEW = 'exact', 'renamed', 'new'
+
+
+def load_renames(path):
+    """previous_name -> current_name map from a two-column CSV"""
+    renames = pd.read_csv(path, dtype=str)
+    return dict(zip(renames['previous_name'].str.strip(), renames['current_name'].str.strip()))
+
+
+def _shares(votes):
+    totals = votes.sum(axis=1, keepdims=True)
+    return np.divide(votes * 100.0, totals, out=np.zeros(votes.shape), where=totals > 0)
+
+
+class SwingIndex:
+    """Join index from a current AggregateCube to a previous election's cube
+
+    Constituencies are matched through hash lookups, in order: an explicit
+    rename map, the exact name, then (region, constituency_id) for names
+    left over on both sides (treated as renamed). Unmatched current
+    constituencies are new; unmatched previous ones are abolished. Parties
+    are matched by name. The index is built once; swing figures are
+    recomputed from the live matrices and memoized until the next update.
+    """
+
+    def __init__(self, current, previous, renames=None):
+        self.current = current
+        self.previous = previous
+
+        names = np.asarray(current.constituency_index, dtype=object)
+        prev_names = np.asarray(previous.constituency_index, dtype=object)
+        prev_lookup = pd.Index(prev_names)
+        renamed_to = pd.Index(list((renames or {}).values()))
+        renamed_from = np.asarray(list((renames or {}).keys()), dtype=object)
+
+        const_map = np.full(len(names), -1, dtype=np.int64)
+        kind = np.full(len(names), NEW, dtype=object)
+
+        hit = renamed_to.get_indexer(names) if len(renamed_to) else np.full(len(names), -1)
+        mapped = hit >= 0
+        const_map[mapped] = prev_lookup.get_indexer(renamed_from[hit[mapped]])
+        kind[const_map >= 0] = RENAMED
+
+        exact = prev_lookup.get_indexer(names)
+        take = (const_map < 0) & (exact >= 0)
+        const_map[take] = exact[take]
+        kind[take] = EXACT
+
+        # (region, constituency_id) fallback for what is still unmatched
+        used = np.zeros(len(prev_names), dtype=bool)
+        used[const_map[const_map >= 0]] = True
+        todo = np.flatnonzero(const_map < 0)
+        free = np.flatnonzero(~used)
+        if len(todo) and len(free) and current.matrix.const_ids is not None:
+            prev_keys = pd.MultiIndex.from_arrays([
+                np.asarray(previous.region_index, dtype=object)[previous.const_region[free]],
+                previous.matrix.const_ids[free]])
+            if prev_keys.is_unique:
+                keys = pd.MultiIndex.from_arrays([
+                    np.asarray(current.region_index, dtype=object)[current.const_region[todo]],
+                    current.matrix.const_ids[todo]])
+                found = prev_keys.get_indexer(keys)
+                ok = found >= 0
+                const_map[todo[ok]] = free[found[ok]]
+                kind[todo[ok]] = RENAMED
+
+        self.const_map = const_map
+        self.kind = kind
+        self.party_map = pd.Index(previous.party_index).get_indexer(current.party_index)
+        matched = np.zeros(len(prev_names), dtype=bool)
+        matched[const_map[const_map >= 0]] = True
+        self.abolished = prev_lookup[~matched]
+        self._memo = Memo(current.lock)
+
+    def apply_deltas(self, delta):
+        """The join is unaffected by count updates; only cached figures are"""
+        self._memo.clear()
+
+    # ------------------------------------------------------------------
+    # Aligned matrices
+    # ------------------------------------------------------------------
+
+    @property
+    def matched(self):
+        return self.const_map >= 0
+
+    def previous_votes(self):
+        """Previous votes on the current constituency x party axes (0 where unmatched)"""
+        aligned = np.zeros(self.current.const_party_votes.shape, dtype=np.int64)
+        rows = np.flatnonzero(self.matched)
+        cols = np.flatnonzero(self.party_map >= 0)
+        aligned[np.ix_(rows, cols)] = self.previous.const_party_votes[
+            np.ix_(self.const_map[rows], self.party_map[cols])]
+        return aligned
+
+    def _aligned(self):
+        return self._memo.get('aligned', self.previous_votes)
+
+    def summary(self):
+        """Matched / renamed / new / abolished constituency counts"""
+        return {
+            'matched': int((self.kind == EXACT).sum()),
+            'renamed': int((self.kind == RENAMED).sum()),
+            'new': int((self.kind == NEW).sum()),
+            'abolished': len(self.abolished),
+        }
+
+    # ------------------------------------------------------------------
+    # Swing
+    # ------------------------------------------------------------------
+
+    def constituency_swing(self):
+        """Long frame per matched constituency and party (calculate_swing)"""
+        def build():
+            cube = self.current
+            rows = np.flatnonzero(self.matched)
+            current = cube.const_party_votes[rows]
+            previous = self._aligned()[rows]
+            share_swing = _shares(current) - _shares(previous)
+            change = current - previous
+            swing_pct = change * 100.0 / np.where(previous > 0, previous, 1)
+            n_party = current.shape[1]
+            frame = pd.DataFrame({
+                'constituency_name': np.repeat(np.asarray(cube.constituency_index, dtype=object)[rows], n_party),
+                'region': np.repeat(np.asarray(cube.region_index, dtype=object)[cube.const_region[rows]], n_party),
+                'match': np.repeat(self.kind[rows], n_party),
+                'party': np.tile(np.asarray(cube.party_index, dtype=object), len(rows)),
+                'current_votes': current.ravel(),
+                'previous_votes': previous.ravel(),
+                'vote_change': change.ravel(),
+                'swing_pct': np.round(swing_pct.ravel(), 2),
+                'share_swing_pts': np.round(share_swing.ravel(), 2),
+                'swing_direction': pd.Categorical.from_codes(
+                    np.searchsorted(SWING_BINS, swing_pct.ravel(), side='left'), SWING_DIRECTIONS),
+            })
+            return frame
+        return self._memo.get('constituency', build)
+
+    def region_swing(self):
+        """Region x party change in vote share (points) over matched constituencies"""
+        def build():
+            cube = self.current
+            weights = self.matched[:, None]
+            current = cube.matrix.region_sums(cube.const_party_votes * weights)
+            previous = cube.matrix.region_sums(self._aligned())
+            return pd.DataFrame(
+                np.round(_shares(current) - _shares(previous), 2),
+                index=cube.region_index, columns=cube.party_index)
+        return self._memo.get('region', build)
+
+    def national_swing(self):
+        """Change in national vote share (points) per party over matched constituencies"""
+        cube = self.current
+        current = (cube.const_party_votes * self.matched[:, None]).sum(axis=0, keepdims=True)
+        previous = self._aligned().sum(axis=0, keepdims=True)
+        return pd.Series((_shares(current) - _shares(previous))[0], index=cube.party_index,
+                         name='swing_pts')
+
+    def uniform_swing_projection(self, swing=None):
+        """Seats under a uniform swing applied to the previous result
+
+        Each matched constituency gets its previous shares plus the national
+        swing (or ``swing``, points per party); new constituencies keep
+        their current shares. Returns seats per party next to the previous
+        and current winners.
+        """
+        cube = self.current
+        swing = self.national_swing() if swing is None else pd.Series(swing)
+        swing = swing.reindex(cube.party_index).fillna(0).to_numpy()
+        previous = _shares(self._aligned())
+        projected = np.where(self.matched[:, None], previous + swing, _shares(cube.const_party_votes))
+        n_party = len(cube.party_index)
+
+        def seats(matrix, mask):
+            return np.bincount(matrix.argmax(axis=1)[mask], minlength=n_party)
+
+        # Previous seats over every previous constituency, on current party axes
+        prev_parties = np.full(len(self.previous.party_index), -1, dtype=np.int64)
+        known = self.party_map >= 0
+        prev_parties[self.party_map[known]] = np.flatnonzero(known)
+        prev_winners = prev_parties[self.previous.const_party_votes.argmax(axis=1)]
+
+        everything = np.ones(len(self.matched), dtype=bool)
+        return pd.DataFrame({
+            'party': cube.party_index,
+            'previous_seats': np.bincount(prev_winners[prev_winners >= 0], minlength=n_party),
+            'uniform_swing_seats': seats(projected, everything),
+            'current_seats': seats(cube.const_party_votes, everything),
+            'national_swing_pts': np.round(swing, 2),
+        }).sort_values('uniform_swing_seats', ascending=False, ignore_index=True)
@@ -0,0 +1,77 @@
+"""
+Paginated Table
+Server-side sorted, paged and projected st.dataframe rendering
+"""
+
+import numpy as np
+import streamlit as st
+
+from election.instrumentation import span
+
+
+class SortIndex:
+    """Per-column row orders of one frame, computed on first use
+
+    A filtered view is sorted by walking the full order and keeping the
+    selected rows, which is a linear pass instead of a sort.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._orders = {}
+
+    def order(self, column, ascending=True):
+        order = self._orders.get(column)
+        if order is None:
+            values = self.frame[column]
+            if hasattr(values, 'cat'):
+                # Sort labels alphabetically, not by category code
+                values = values.cat.reorder_categories(sorted(values.cat.categories)).cat.codes
+            order = self._orders[column] = np.argsort(values.to_numpy(), kind='stable')
+        return order if ascending else order[::-1]
+
+    def positions(self, column=None, ascending=True, rows=None):
+        """Row positions in display order, optionally restricted to ``rows``"""
+        if column is None:
+            return np.arange(len(self.frame)) if rows is None else np.asarray(rows)
+        order = self.order(column, ascending)
+        if rows is None:
+            return order
+        keep = np.zeros(len(self.frame), dtype=bool)
+        keep[rows] = True
+        return order[keep[order]]
+
+
+def paginated_table(frame, key, sort_index, rows=None, columns=None, page_sizes=(25, 50, 100, 250)):
+    """Render one page of ``frame`` (optionally only ``rows``) with sort and column controls
+
+    Only the visible slice is sent to the browser.
+    """
+    columns = list(columns or frame.columns)
+    n_rows = len(frame) if rows is None else len(rows)
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        shown = st.multiselect("Columns", columns, default=columns, key=f"{key}_columns")
+    with col2:
+        sort_by = st.selectbox("Sort by", ['(none)'] + columns, key=f"{key}_sort")
+    with col3:
+        descending = st.toggle("Descending", value=True, key=f"{key}_desc")
+    with col4:
+        page_size = st.selectbox("Rows per page", page_sizes, index=1, key=f"{key}_size")
+
+    n_pages = max(1, -(-n_rows // page_size))
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = st.number_input(f"Page (of {n_pages})", 1, n_pages, key=f"{key}_page")
+
+    with span('table', rows=n_rows) as record:
+        column = None if sort_by == '(none)' else sort_by
+        positions = sort_index.positions(column, not descending, rows)
+        start = (page - 1) * page_size
+        visible = positions[start:start + page_size]
+        page_frame = frame.iloc[visible][shown or columns]
+        record.add(payload=page_frame)
+
+    st.dataframe(page_frame, use_container_width=True)
+    st.caption(f"Rows {min(start + 1, n_rows):,}–{start + len(visible):,} of {n_rows:,}")
@@ -0,0 +1,198 @@
+"""
+Count Timeline
+Append-only, time-indexed store of count snapshots with incremental rollups
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+RESOLUTIONS = {'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Seconds each rollup keeps its buckets (None keeps them forever)
+ROLLUP_RETENTION = {'minute': 2 * 86400, 'hour': 90 * 86400, 'day': None}
+
+CHUNK_EVENTS = 1 << 16
+
+
+class Rollup:
+    """Counted-vote increments per time bucket, by party and by region"""
+
+    def __init__(self, seconds, n_parties, n_regions):
+        self.seconds = seconds
+        self.buckets = np.empty(0, dtype=np.int64)
+        self.party = np.zeros((0, n_parties), dtype=np.int64)
+        self.region = np.zeros((0, n_regions), dtype=np.int64)
+        self.dropped_party = np.zeros(n_parties, dtype=np.int64)
+        self.dropped_region = np.zeros(n_regions, dtype=np.int64)
+
+    def add(self, ts, party_codes, region_codes, d_counted):
+        starts = ts // self.seconds * self.seconds
+        keys, inverse = np.unique(starts, return_inverse=True)
+        new = keys[~np.isin(keys, self.buckets)]
+        if len(new):
+            at = np.searchsorted(self.buckets, new)
+            self.buckets = np.insert(self.buckets, at, new)
+            self.party = np.insert(self.party, at, 0, axis=0)
+            self.region = np.insert(self.region, at, 0, axis=0)
+        rows = np.searchsorted(self.buckets, keys)[inverse]
+        np.add.at(self.party, (rows, party_codes), d_counted)
+        np.add.at(self.region, (rows, region_codes), d_counted)
+
+    def drop_before(self, cutoff):
+        """Fold buckets older than ``cutoff`` into the running offset"""
+        keep = np.searchsorted(self.buckets, cutoff)
+        if keep:
+            self.dropped_party += self.party[:keep].sum(axis=0)
+            self.dropped_region += self.region[:keep].sum(axis=0)
+            self.buckets = self.buckets[keep:]
+            self.party = self.party[keep:]
+            self.region = self.region[keep:]
+
+    @property
+    def nbytes(self):
+        return self.buckets.nbytes + self.party.nbytes + self.region.nbytes
+
+
+class TimelineStore:
+    """Counting history of one dataset
+
+    Every count batch appends one event per updated (constituency, party)
+    cell to fixed-size columnar chunks (timestamp, constituency code, party
+    code, counted level) and folds its increments into minute/hour/day
+    rollups in the same call. Raw events older than ``raw_seconds`` or
+    beyond ``max_events`` are compacted away (the rollups already hold
+    them), and each rollup drops buckets past its retention, so memory
+    stays bounded however long counting runs.
+    """
+
+    def __init__(self, cube, raw_seconds=6 * 3600, max_events=5_000_000, clock=time.time):
+        self.cube = cube
+        self.clock = clock
+        self.raw_seconds = raw_seconds
+        self.max_events = max_events
+        self.started_at = int(clock())
+        self.baseline_party = cube.party_counted_votes.copy()
+        self.baseline_region = cube.matrix.region_sums(cube.const_party_counted).sum(axis=1)
+        n_parties, n_regions = len(cube.party_index), len(cube.region_index)
+        self.rollups = {name: Rollup(seconds, n_parties, n_regions) for name, seconds in RESOLUTIONS.items()}
+        self._chunks = []
+        self._fill = 0
+        self.events = 0
+        self.compacted = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def _new_chunk(self):
+        self._chunks.append({
+            'ts': np.empty(CHUNK_EVENTS, dtype=np.int64),
+            'const': np.empty(CHUNK_EVENTS, dtype=np.int32),
+            'party': np.empty(CHUNK_EVENTS, dtype=np.int16),
+            'counted': np.empty(CHUNK_EVENTS, dtype=np.int64),
+        })
+        self._fill = 0
+
+    def append(self, ts, const_codes, party_codes, counted, d_counted):
+        """Record counted levels (and their increments) for a batch of cells"""
+        n = len(const_codes)
+        if n == 0:
+            return
+        ts = np.broadcast_to(np.asarray(ts, dtype=np.int64), (n,))
+        region_codes = self.cube.const_region[const_codes]
+        with self._lock:
+            for rollup in self.rollups.values():
+                rollup.add(ts, party_codes, region_codes, d_counted)
+            done = 0
+            while done < n:
+                if not self._chunks or self._fill == CHUNK_EVENTS:
+                    self._new_chunk()
+                chunk = self._chunks[-1]
+                take = min(n - done, CHUNK_EVENTS - self._fill)
+                window = slice(self._fill, self._fill + take)
+                chunk['ts'][window] = ts[done:done + take]
+                chunk['const'][window] = const_codes[done:done + take]
+                chunk['party'][window] = party_codes[done:done + take]
+                chunk['counted'][window] = counted[done:done + take]
+                self._fill += take
+                done += take
+            self.events += n
+            self._compact(int(ts.max()))
+
+    def apply_deltas(self, delta):
+        """Record a count batch at the current time"""
+        changed = delta.d_counted != 0
+        const, party = delta.const_codes[changed], delta.party_codes[changed]
+        self.append(int(self.clock()), const, party, self.cube.const_party_counted[const, party],
+                    delta.d_counted[changed])
+
+    def _compact(self, now):
+        cutoff = now - self.raw_seconds
+        while len(self._chunks) > 1 and (
+                self._chunks[0]['ts'][-1] < cutoff or self.resident_events > self.max_events):
+            self._chunks.pop(0)
+            self.compacted += CHUNK_EVENTS
+        for name, rollup in self.rollups.items():
+            if ROLLUP_RETENTION[name] is not None:
+                rollup.drop_before(now - ROLLUP_RETENTION[name])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def resident_events(self):
+        return max(len(self._chunks) - 1, 0) * CHUNK_EVENTS + (self._fill if self._chunks else 0)
+
+    def raw(self):
+        """Resident raw events as a frame (oldest first)"""
+        with self._lock:
+            parts = [{k: v[:self._fill] if i == len(self._chunks) - 1 else v for k, v in c.items()}
+                     for i, c in enumerate(self._chunks)]
+        if not parts:
+            return pd.DataFrame(columns=['timestamp', 'constituency_name', 'party', 'counted_votes'])
+        columns = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        cube = self.cube
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(columns['ts'], unit='s'),
+            'constituency_name': pd.Categorical.from_codes(columns['const'], cube.constituency_index),
+            'party': pd.Categorical.from_codes(columns['party'], cube.party_index),
+            'counted_votes': columns['counted'],
+        })
+
+    def progress(self, resolution='minute', by='party'):
+        """Cumulative counted votes per bucket (wide frame, one column per party or region)
+
+        The first row is the dataset's counted state when the timeline
+        started, placed one bucket before the first bucket so the two never
+        share a timestamp; buckets compacted out of this rollup are folded
+        into it.
+        """
+        rollup = self.rollups[resolution]
+        with self._lock:
+            if by == 'party':
+                labels, base = self.cube.party_index, self.baseline_party + rollup.dropped_party
+                values = rollup.party.copy()
+            else:
+                labels, base = self.cube.region_index, self.baseline_region + rollup.dropped_region
+                values = rollup.region.copy()
+            buckets = rollup.buckets.copy()
+        start = int(buckets[0]) - rollup.seconds if len(buckets) else self.started_at
+        index = pd.to_datetime(np.concatenate([[start], buckets]), unit='s')
+        cumulative = np.vstack([base, base + np.cumsum(values, axis=0)])
+        return pd.DataFrame(cumulative, index=pd.Index(index, name='time'), columns=labels)
+
+    def stats(self):
+        return {
+            'events': self.events,
+            'resident_events': self.resident_events,
+            'compacted_events': self.compacted,
+            'chunks': len(self._chunks),
+            'raw_bytes': sum(a.nbytes for c in self._chunks for a in c.values()),
+            'rollup_bytes': sum(r.nbytes for r in self.rollups.values()),
+            'buckets': {name: len(r.buckets) for name, r in self.rollups.items()},
+        }
@@ -0,0 +1,119 @@
+"""
+Constituency Winners
+Winner, runner-up and margin per constituency from the aggregate cube
+"""
+
+import numpy as np
+import pandas as pd
+
+from election.memo import Memo
+
+MARGIN_BINS = (5, 10, 20)
+MARGIN_CATEGORIES = ('Close (<5%)', 'Moderate (5-10%)', 'Comfortable (10-20%)', 'Landslide (20%+)')
+
+
+class WinnersTable:
+    """Per-constituency winners and margins (identify_winners / calculate_vote_margins)
+
+    Computed with two argmax passes over the cube's constituency x party
+    vote matrix; ties go to the party listed first. Count updates re-score
+    only the constituencies in the batch (see ``apply_deltas``), so the
+    table must be built on the cube the ingestor maintains.
+    """
+
+    def __init__(self, cube):
+        self.cube = cube
+        n = cube.n_constituencies
+        self.winner = np.zeros(n, dtype=np.intp)
+        self.runner_up = np.full(n, -1, dtype=np.intp)
+        self.winner_votes = np.zeros(n, dtype=np.int64)
+        self.runner_up_votes = np.zeros(n, dtype=np.int64)
+        self._memo = Memo(cube.lock)
+        self._score(slice(None))
+
+    def _score(self, idx):
+        votes = self.cube.const_party_votes[idx]
+        rows = np.arange(len(votes))
+        winner = votes.argmax(axis=1)
+        self.winner[idx] = winner
+        self.winner_votes[idx] = votes[rows, winner]
+        if votes.shape[1] > 1:
+            rest = votes.copy()
+            rest[rows, winner] = -1
+            runner_up = rest.argmax(axis=1)
+            self.runner_up[idx] = runner_up
+            self.runner_up_votes[idx] = votes[rows, runner_up]
+
+    def apply_deltas(self, delta):
+        """Re-score the constituencies touched by a count batch"""
+        self._score(np.unique(delta.const_codes))
+        self._memo.clear()
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    @property
+    def margin_votes(self):
+        return self.winner_votes - self.runner_up_votes
+
+    @property
+    def margin_pct(self):
+        pair = self.winner_votes + self.runner_up_votes
+        return np.divide(self.margin_votes * 100.0, pair, out=np.zeros(len(pair)), where=pair > 0)
+
+    def _table(self):
+        """One row per constituency in cube order"""
+        def build():
+            cube = self.cube
+            parties = np.asarray(cube.party_index, dtype=object)
+            totals = cube.const_party_votes.sum(axis=1)
+            margin_pct = self.margin_pct
+            runner_up = np.where(self.runner_up >= 0, parties[np.maximum(self.runner_up, 0)], None)
+            frame = pd.DataFrame({
+                'constituency_name': np.asarray(cube.constituency_index, dtype=object),
+                'region': np.asarray(cube.region_index, dtype=object)[cube.const_region],
+                'winning_party': parties[self.winner],
+                'winning_votes': self.winner_votes,
+                'vote_share': np.round(np.divide(self.winner_votes * 100.0, totals,
+                                                 out=np.zeros(len(totals)), where=totals > 0), 2),
+                'runner_up': runner_up,
+                'runner_up_votes': self.runner_up_votes,
+                'margin_votes': self.margin_votes,
+                'margin_pct': np.round(margin_pct, 2),
+                'margin_category': pd.Categorical.from_codes(
+                    np.searchsorted(MARGIN_BINS, margin_pct, side='right'), MARGIN_CATEGORIES),
+            })
+            return frame
+        return self._memo.get('table', build)
+
+    def frame(self):
+        """One row per constituency, sorted by name"""
+        return self._table().sort_values('constituency_name', ignore_index=True)
+
+    def closest(self, n=10):
+        """The ``n`` constituencies with the smallest margin %"""
+        order = np.argsort(self.margin_pct, kind='stable')[:n]
+        return self._table().iloc[order].reset_index(drop=True)
+
+    def seat_tally(self):
+        """Seats won per party with seat share, largest first"""
+        def build():
+            cube = self.cube
+            seats = np.bincount(self.winner, minlength=len(cube.party_index))
+            tally = pd.DataFrame({'party': cube.party_index, 'seats': seats})
+            tally['seat_share'] = (tally['seats'] / max(len(self.winner), 1) * 100).round(2)
+            return tally.sort_values('seats', ascending=False, ignore_index=True)
+        return self._memo.get('tally', build)
+
+    def region_tally(self):
+        """Region x party seat counts"""
+        cube = self.cube
+        n_party = len(cube.party_index)
+        flat = cube.const_region * n_party + self.winner
+        counts = np.bincount(flat, minlength=len(cube.region_index) * n_party)
+        return pd.DataFrame(counts.reshape(-1, n_party), index=cube.region_index, columns=cube.party_index)
+
+    @property
+    def majority(self):
+        return len(self.winner) // 2 + 1
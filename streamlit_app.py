@@ -6,12 +6,34 @@ Version: 1.0.0
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from datetime import datetime
 import time
+import os
+
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from election.generator import build_election_data, DEFAULT_PARTIES
+from election.schema import compact_frame, memory_report
+from election.loader import load_results, LoadResult
+from election.snapshot import SnapshotCache, source_key, file_source_key
+from election.registry import DatasetRegistry
+from election.simulation import project_seats
+from election.prediction_model import MODELS, fit_model
+from election.table import paginated_table
+from election.charts import box_figure, histogram_figure, downsample
+from election.figure_cache import FigureCache
+from election.aggregates import AggregateCube
+from election.swing import SwingIndex, load_renames
+from election.timeline import RESOLUTIONS
+from election.feed import FeedConsumer
+from election.jobs import JobManager, job_key, DONE, FAILED, CANCELLED
+from election.instrumentation import Metrics, Profile, span, serve_prometheus, pyinstrument
+from election import pages
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -64,62 +86,240 @@ st.markdown("""
 
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
-if 'election_data' not in st.session_state:
-    st.session_state.election_data = None
+if 'data_version' not in st.session_state:
+    st.session_state.data_version = None
 
 # ============================================================================
 # DATA GENERATION
 # ============================================================================
 
-@st.cache_data
-def generate_election_data():
+def generate_election_data(n_regions=5, constituencies_per_region=20,
+                           parties=DEFAULT_PARTIES, seed=42):
     """Generate sample election data"""
-    np.random.seed(42)
-    
-    regions = ['North', 'South', 'East', 'West', 'Central']
-    parties = ['Party A', 'Party B', 'Party C', 'Party D', 'Independent']
-    
-    data_list = []
-    for region in regions:
-        for const_id in range(1, 21):
-            constituency_name = f"{region} Constituency {const_id}"
-            total_voters = np.random.randint(50000, 200000)
-            
-            for party in parties:
-                base_turnout = np.random.uniform(0.6, 0.85)
-                
-                if party == 'Party A':
-                    party_strength = np.random.uniform(0.25, 0.35)
-                elif party == 'Party B':
-                    party_strength = np.random.uniform(0.20, 0.30)
-                elif party == 'Party C':
-                    party_strength = np.random.uniform(0.15, 0.25)
-                elif party == 'Party D':
-                    party_strength = np.random.uniform(0.10, 0.20)
-                else:
-                    party_strength = np.random.uniform(0.05, 0.15)
-                
-                votes = int(total_voters * base_turnout * party_strength)
-                
-                data_list.append({
-                    'region': region,
-                    'constituency_id': const_id,
-                    'constituency_name': constituency_name,
-                    'total_voters': total_voters,
-                    'party': party,
-                    'votes': votes,
-                    'counting_status': np.random.choice(
-                        ['Complete', 'In Progress', 'Pending'],
-                        p=[0.7, 0.25, 0.05]
-                    ),
-                    'counted_votes': int(votes * np.random.uniform(0.75, 0.95))
-                })
-    
-    df = pd.DataFrame(data_list)
-    df['total_constituency_votes'] = df.groupby('constituency_name')['votes'].transform('sum')
-    df['vote_share_pct'] = (df['votes'] / df['total_constituency_votes'] * 100).round(2)
-    
-    return df
+    return compact_frame(build_election_data(n_regions, constituencies_per_region, parties, seed))
+
+@st.cache_resource
+def get_snapshots():
+    """On-disk Arrow snapshot cache shared by every process start"""
+    return SnapshotCache(os.environ.get('ELECTION_SNAPSHOT_DIR', '.snapshots'))
+
+def load_synthetic_data():
+    """Synthetic dataset, memory-mapped from its snapshot when available"""
+    key = source_key('synthetic', 5, 20, DEFAULT_PARTIES, 42)
+    frame, _ = get_snapshots().load_or_build('synthetic', key, lambda: (generate_election_data(), {}))
+    return frame
+
+@st.cache_resource
+def load_results_file(path, snapshot='results'):
+    """Load an official results file (CSV/Parquet) with its reject report
+
+    Each ``snapshot`` name keeps one file on disk, so results files that
+    are in use together need distinct names.
+    """
+    return LoadResult(*get_snapshots().load_or_build(
+        snapshot, file_source_key(path), lambda: load_results(path)))
+
+def results_file():
+    """Results file configured for this deployment, if any"""
+    return os.environ.get('ELECTION_RESULTS_FILE')
+
+@st.cache_resource
+def get_previous_election():
+    """Aggregate cube of the previous election (ELECTION_PREVIOUS_FILE or a synthetic one)"""
+    path = os.environ.get('ELECTION_PREVIOUS_FILE')
+    if path:
+        frame = load_results_file(path, 'previous-results').frame
+    else:
+        key = source_key('synthetic', 5, 20, DEFAULT_PARTIES, 41)
+        frame, _ = get_snapshots().load_or_build(
+            'previous', key, lambda: (generate_election_data(seed=41), {}))
+    return AggregateCube(frame)
+
+# ============================================================================
+# SHARED DATASET REGISTRY
+# ============================================================================
+
+@st.cache_resource
+def get_registry():
+    """Process-wide registry shared by every session"""
+    return DatasetRegistry()
+
+def session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else 'local'
+
+def session_alive(session):
+    """Whether a session is still connected (always true outside ``streamlit run``)"""
+    return not Runtime.exists() or Runtime.instance().is_active_session(session)
+
+def attach_dataset():
+    """Point this session at the shared synthetic dataset"""
+    registry = get_registry()
+    path = results_file()
+    if path:
+        version = registry.load(('file', path), lambda: load_results_file(path).frame)
+    else:
+        version = registry.load('synthetic', load_synthetic_data)
+    registry.acquire(version, session_id())
+    st.session_state.data_version = version
+    # Score the dataset for anomalies and start its count timeline as it
+    # is loaded; live updates keep both current
+    get_anomalies()
+    get_timeline()
+
+def detach_dataset():
+    """Release this session's hold on its dataset version"""
+    if st.session_state.data_version is not None:
+        get_registry().release(st.session_state.data_version, session_id())
+        st.session_state.data_version = None
+
+def hold_dataset():
+    """Drop holds of closed sessions, then re-assert this session's hold
+
+    Only Logout releases a hold explicitly, so holds of sessions whose tab
+    was closed are swept against the runtime's connected sessions on every
+    run. A session that reconnects re-acquires its hold on its next run.
+    """
+    registry = get_registry()
+    registry.sweep(session_alive)
+    if st.session_state.data_version in registry:
+        registry.acquire(st.session_state.data_version, session_id())
+
+def get_entry():
+    """Registry entry for the session's dataset version"""
+    registry = get_registry()
+    if st.session_state.data_version not in registry:
+        attach_dataset()
+    return registry.get(st.session_state.data_version)
+
+def get_dataset():
+    """Shared read-only election frame for this session"""
+    return get_entry().frame
+
+def get_aggregates():
+    """Aggregate cube for the session's current dataset"""
+    return get_entry().aggregates
+
+def get_filter_index():
+    """Row-position index for region/party/status filters"""
+    return pages.filter_index(get_entry())
+
+def get_winners():
+    """Per-constituency winners and margins, kept current by live updates"""
+    return pages.winners(get_entry())
+
+def get_swing():
+    """Join index against the previous election, built once per dataset version"""
+    entry = get_entry()
+    renames = os.environ.get('ELECTION_RENAMES_FILE')
+    return entry.derived('swing', lambda _: SwingIndex(
+        entry.aggregates, get_previous_election(), load_renames(renames) if renames else None))
+
+def get_anomalies():
+    """Anomaly scores for the session's dataset, re-scored on live updates"""
+    return pages.anomalies(get_entry())
+
+def get_timeline():
+    """Counting history of the session's dataset since it was loaded"""
+    return pages.timeline(get_entry())
+
+def get_constituencies():
+    """Constituency dimension table (electorate, status, turnout)"""
+    return pages.constituencies(get_entry())
+
+def get_sort_index():
+    """Precomputed row orders for paginated tables"""
+    return pages.sort_index(get_entry())
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide LRU of serialized figures"""
+    return FigureCache(int(os.environ.get('ELECTION_FIGURE_CACHE_MB', 64)) * 1024 * 1024)
+
+def cached_figure(page, chart, filters, builder):
+    """Figure for the session's dataset revision, built only on a cache miss"""
+    cache = get_figure_cache()
+    with span('figure') as record:
+        payload = cache.get_or_build_json(cache.make_key(get_entry().key, page, chart, filters), builder)
+        record.add(payload=payload)
+        return pio.from_json(payload)
+
+@st.cache_resource
+def get_jobs():
+    """Process-wide background job pool (ELECTION_JOB_WORKERS=0 runs jobs on a thread)"""
+    return JobManager(int(os.environ.get('ELECTION_JOB_WORKERS', 2)))
+
+def run_job(name, params, fn, *args, poll=0.5, **kwargs):
+    """Result of a background job for the session's dataset version, and the revision it was computed at
+
+    Jobs are keyed on the dataset version, not the revision, so a live
+    feed does not queue a fresh job on every poll; a result computed at
+    an older revision is shown with a Recompute button. Returns
+    (None, None) while the job is running (render_page polls it with a
+    rerun once the page's metrics trace has closed) or when it failed or
+    was cancelled.
+    """
+    jobs = get_jobs()
+    entry = get_entry()
+    key = job_key(name, entry.version, params)
+    info = {'revision': entry.revision}
+    job_id = jobs.submit(key, fn, *args, label=name, info=info, **kwargs)
+    state = jobs.status(job_id)
+    if state['status'] == DONE:
+        revision = state['info']['revision']
+        if revision != entry.revision:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.caption(f"{name} computed at revision {revision}; "
+                           f"the dataset is now at revision {entry.revision}")
+            with col2:
+                if st.button("🔁 Recompute", key=f"recompute_{job_id}"):
+                    jobs.submit(key, fn, *args, label=name, restart=True, info=info, **kwargs)
+                    st.rerun()
+        with span('job'):
+            return jobs.result(job_id), revision
+    if state['status'] in (FAILED, CANCELLED):
+        if state['status'] == FAILED:
+            st.error(f"{name} failed: {state['error']}")
+        else:
+            st.warning(f"{name} was cancelled")
+        if st.button("🔁 Restart", key=f"restart_{job_id}"):
+            jobs.submit(key, fn, *args, label=name, restart=True, info=info, **kwargs)
+            st.rerun()
+        return None, None
+    with st.status(f"{name} running in the background…", expanded=True):
+        st.progress(state['progress'], text=state['message'] or state['status'])
+        if st.button("✖ Cancel", key=f"cancel_{job_id}"):
+            jobs.cancel(job_id)
+            st.rerun()
+    st.session_state.job_poll = poll
+    return None, None
+
+@st.cache_resource
+def get_metrics():
+    """Process-wide rerun metrics; ELECTION_METRICS_PORT also serves /metrics"""
+    metrics = Metrics()
+    if os.environ.get('ELECTION_METRICS_PORT'):
+        serve_prometheus(metrics, int(os.environ['ELECTION_METRICS_PORT']))
+    return metrics
+
+def is_admin():
+    return st.session_state.get('username', 'admin') == 'admin'
+
+@st.cache_resource
+def get_feed():
+    """Background consumer of ELECTION_FEED_URL applying updates to the latest dataset"""
+    source = os.environ.get('ELECTION_FEED_URL')
+    if not source:
+        return None
+    registry = get_registry()
+    
+    def apply(batch):
+        return registry.get(registry.latest).apply_counts(batch)
+    
+    return FeedConsumer(source, apply,
+                        batch_window=float(os.environ.get('ELECTION_FEED_WINDOW', 1.0)),
+                        queue_size=int(os.environ.get('ELECTION_FEED_QUEUE', 50_000))).start()
 
 # ============================================================================
 # AUTHENTICATION
@@ -148,7 +348,8 @@ def login_page():
             if st.button("🚀 Login"):
                 if username == "admin" and password == "password123":
                     st.session_state.authenticated = True
-                    st.session_state.election_data = generate_election_data()
+                    st.session_state.username = username
+                    attach_dataset()
                     st.success("✅ Login successful!")
                     time.sleep(1)
                     st.rerun()
@@ -159,31 +360,6 @@ def login_page():
             if st.button("ℹ️ Demo Info"):
                 st.info("**Demo Credentials:**\n\nUsername: `admin`\n\nPassword: `password123`")
 
-# ============================================================================
-# PREDICTION FUNCTIONS
-# ============================================================================
-
-def predict_winner_ensemble(df):
-    """Ensemble prediction"""
-    party_stats = df.groupby('party').agg({
-        'votes': ['sum', 'mean', 'std', 'count'],
-        'vote_share_pct': 'mean'
-    }).reset_index()
-    
-    party_stats.columns = ['party', 'total_votes', 'avg_votes', 'std_votes', 'count', 'avg_share']
-    
-    # Weighted scoring
-    party_stats['score'] = (
-        party_stats['total_votes'] * 0.5 +
-        party_stats['count'] * 1000 * 0.3 +
-        party_stats['avg_share'] * 100 * 0.2
-    )
-    
-    party_stats['win_probability'] = (party_stats['score'] / party_stats['score'].sum() * 100).round(2)
-    party_stats['predicted_votes'] = (party_stats['total_votes'] * 1.05).astype(int)
-    
-    return party_stats.sort_values('win_probability', ascending=False)
-
 # ============================================================================
 # PAGE FUNCTIONS
 # ============================================================================
@@ -197,24 +373,28 @@ def home_page():
         </div>
     """, unsafe_allow_html=True)
     
-    df = st.session_state.election_data
+    with span('data') as record:
+        entry = get_entry()
+        record.add(rows=entry.aggregates.n_rows)
+    
+    with span('aggregate') as record:
+        data = pages.home_data(entry)
+        record.add(rows=data['n_constituencies'], payload=data['seat_tally'])
     
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 Total Votes", f"{df['votes'].sum():,}")
+        st.metric("📊 Total Votes", f"{data['total_votes']:,}")
     
     with col2:
-        st.metric("📍 Constituencies", df['constituency_name'].nunique())
+        st.metric("📍 Constituencies", data['n_constituencies'])
     
     with col3:
-        turnout = (df['votes'].sum() / df.groupby('constituency_name')['total_voters'].first().sum() * 100)
-        st.metric("👥 Turnout", f"{turnout:.1f}%")
+        st.metric("👥 Turnout", f"{data['turnout_pct']:.1f}%")
     
     with col4:
-        leading = df.groupby('party')['votes'].sum().idxmax()
-        st.metric("🏆 Leading Party", leading)
+        st.metric("🏆 Leading Party", data['leading_party'])
     
     st.markdown("---")
     
@@ -223,44 +403,82 @@ def home_page():
     
     with col1:
         st.markdown("#### 📈 Party Performance")
-        party_votes = df.groupby('party')['votes'].sum().reset_index()
-        fig = px.bar(party_votes, x='party', y='votes', 
-                     color='votes',
-                     color_continuous_scale='viridis',
-                     title='Total Votes by Party')
-        fig.update_layout(showlegend=False, height=400)
+        fig = cached_figure('home', 'party_performance', None, lambda: px.bar(
+            data['party_distribution'], x='party', y='votes',
+            color='votes',
+            color_continuous_scale='viridis',
+            title='Total Votes by Party').update_layout(showlegend=False, height=400))
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.markdown("#### 🗺️ Regional Distribution")
-        region_votes = df.groupby('region')['votes'].sum().reset_index()
-        fig = px.pie(region_votes, values='votes', names='region',
-                     title='Votes by Region')
-        fig.update_layout(height=400)
+        fig = cached_figure('home', 'regional_distribution', None, lambda: px.pie(
+            data['region_votes'], values='votes', names='region',
+            title='Votes by Region').update_layout(height=400))
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Seat tally
+    majority, tally = data['majority'], data['seat_tally']
+    st.markdown(f"#### 🏛️ Seat Tally (majority: {majority})")
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        fig = cached_figure('home', 'seat_tally', None, lambda: px.bar(
+            tally, x='party', y='seats', color='party', text='seats',
+            title='Constituencies Won by Party').add_hline(
+                y=majority, line_dash='dash', annotation_text='Majority'))
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.dataframe(tally, use_container_width=True, hide_index=True)
+        st.dataframe(data['margin_categories'], use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Turnout
+    st.markdown("#### 👥 Turnout by Region")
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.dataframe(data['region_turnout'], use_container_width=True)
+    
+    with col2:
+        fig = cached_figure('home', 'turnout_categories', None, lambda: px.bar(
+            data['turnout_categories'], x='turnout_category', y='constituencies',
+            title='Constituencies by Turnout'))
         st.plotly_chart(fig, use_container_width=True)
 
 def voting_dashboard():
     """Voting dashboard"""
     st.markdown("# 📊 Voting Dashboard - Live Analysis")
     
-    df = st.session_state.election_data
+    with span('data') as record:
+        entry = get_entry()
+        df, cube = entry.frame, entry.aggregates
+        record.add(rows=len(df))
     
     # Filters
     col1, col2, col3 = st.columns(3)
     with col1:
-        selected_region = st.selectbox("Region", ['All'] + list(df['region'].unique()))
+        selected_region = st.selectbox("Region", ['All'] + cube.regions, key='filter_region')
     with col2:
-        selected_party = st.selectbox("Party", ['All'] + list(df['party'].unique()))
+        selected_party = st.selectbox("Party", ['All'] + cube.parties, key='filter_party')
     with col3:
-        if st.button("🔄 Refresh"):
-            st.rerun()
+        # A click already reruns the script; charts come from the figure cache
+        # and only change once the dataset revision has advanced
+        if st.button("🔄 Refresh") and st.session_state.get('voting_seen_key') == entry.key:
+            st.toast("No new results since the last refresh")
+    st.session_state.voting_seen_key = entry.key
     
     # Apply filters
-    filtered_df = df.copy()
-    if selected_region != 'All':
-        filtered_df = filtered_df[filtered_df['region'] == selected_region]
-    if selected_party != 'All':
-        filtered_df = filtered_df[filtered_df['party'] == selected_party]
+    region_key = None if selected_region == 'All' else selected_region
+    party_key = None if selected_party == 'All' else selected_party
+    with span('aggregate') as record:
+        data = pages.voting_data(entry, region_key, party_key)
+        record.add(rows=len(data['rows']))
+    filters = {'region': region_key, 'party': party_key}
     
     st.markdown("---")
     
@@ -268,67 +486,121 @@ def voting_dashboard():
     
     with col1:
         st.markdown("#### 📊 Vote Distribution")
-        party_dist = filtered_df.groupby('party')['votes'].sum().reset_index()
-        fig = px.bar(party_dist, x='party', y='votes', color='votes')
+        fig = cached_figure('voting', 'vote_distribution', filters, lambda: px.bar(
+            data['party_distribution'], x='party', y='votes', color='votes'))
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.markdown("#### 🏅 Top Constituencies")
-        top = filtered_df.groupby('constituency_name')['votes'].sum().nlargest(10).reset_index()
-        fig = px.bar(top, y='constituency_name', x='votes', orientation='h')
-        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+        fig = cached_figure('voting', 'top_constituencies', filters, lambda: px.bar(
+            data['top_constituencies'], y='constituency_name', x='votes',
+            orientation='h').update_layout(yaxis={'categoryorder': 'total ascending'}))
         st.plotly_chart(fig, use_container_width=True)
     
-    st.dataframe(filtered_df, use_container_width=True)
+    paginated_table(df, 'voting_table', get_sort_index(), rows=data['rows'])
 
-def counting_dashboard():
-    """Counting dashboard"""
-    st.markdown("# 🧮 Counting Dashboard - Real-time Updates")
+def counting_view(entry, resolution, by):
+    """Metrics, charts and closest races for one dataset revision of the counting page"""
+    with span('aggregate') as record:
+        data = pages.counting_data(entry, resolution, by)
+        record.add(rows=entry.aggregates.n_constituencies, payload=data['progress'])
+    view = {'key': (entry.key, resolution, by),
+            'caption': f"Dataset v{entry.version} · {entry.revision} live update batches applied",
+            'status': data['status'], 'closest': data['closest']}
+    view['progress_by_region'] = cached_figure('counting', 'progress_by_region', None, lambda: px.bar(
+        data['region_status'], x='region', y='count', color='counting_status', barmode='stack'))
+    view['leading_party'] = cached_figure('counting', 'leading_party', None, lambda: px.pie(
+        data['party_counted'], values='counted_votes', names='party'))
+    
+    progress = data['progress']
+    view['progress_over_time'] = None
+    if len(progress) >= 2:
+        def progress_chart():
+            wide = downsample(progress.assign(total=progress.sum(axis=1)).reset_index(), 'time', 'total', 1000)
+            return px.line(wide.drop(columns='total').melt(id_vars='time', var_name=by,
+                                                           value_name='counted_votes'),
+                           x='time', y='counted_votes', color=by)
+        view['progress_over_time'] = cached_figure('counting', 'progress_over_time',
+                                                   {'resolution': resolution, 'by': by}, progress_chart)
+    return view
+
+def counting_live(resolution, by):
+    """Counting metrics and charts; timed reruns redraw the stored view unless the revision moved"""
+    entry = get_entry()
+    view = st.session_state.get('counting_view')
+    if view is None or view['key'] != (entry.key, resolution, by):
+        view = st.session_state.counting_view = counting_view(entry, resolution, by)
+    
+    st.caption(view['caption'])
+    feed = get_feed()
+    if feed is not None:
+        stats = feed.stats.snapshot()
+        st.caption(f"📡 {'Live' if feed.running else 'Stopped'} feed · {stats['updates_applied']:,} updates · "
+                   f"queue {stats['queue_depth']:,} · last batch {stats['last_batch_at'] or '—'}")
+    
+    for col, (label, value) in zip(st.columns(3), view['status']):
+        with col:
+            st.metric(label, value)
     
-    df = st.session_state.election_data
+    st.markdown("---")
     
-    col1, col2, col3 = st.columns(3)
+    col1, col2 = st.columns(2)
     
     with col1:
-        complete = len(df[df['counting_status'] == 'Complete'])
-        st.metric("✅ Complete", complete)
+        st.markdown("#### 📊 Progress by Region")
+        st.plotly_chart(view['progress_by_region'], use_container_width=True)
     
     with col2:
-        in_progress = len(df[df['counting_status'] == 'In Progress'])
-        st.metric("⏳ In Progress", in_progress)
+        st.markdown("#### 🏆 Leading Party")
+        st.plotly_chart(view['leading_party'], use_container_width=True)
     
-    with col3:
-        pending = len(df[df['counting_status'] == 'Pending'])
-        st.metric("⏰ Pending", pending)
+    st.markdown("#### 📈 Counting Progress Over Time")
+    if view['progress_over_time'] is None:
+        st.info("No count updates received yet; progress appears here as live counts arrive.")
+    else:
+        st.plotly_chart(view['progress_over_time'], use_container_width=True)
     
-    st.markdown("---")
+    st.markdown("#### 🎯 Closest Races")
+    st.dataframe(view['closest'], use_container_width=True, hide_index=True)
+
+def counting_dashboard():
+    """Counting dashboard"""
+    st.markdown("# 🧮 Counting Dashboard - Real-time Updates")
     
-    col1, col2 = st.columns(2)
+    with span('data') as record:
+        df = get_dataset()
+        record.add(rows=len(df))
     
+    col1, col2, col3 = st.columns(3)
     with col1:
-        st.markdown("#### 📊 Progress by Region")
-        status = df.groupby(['region', 'counting_status']).size().reset_index(name='count')
-        fig = px.bar(status, x='region', y='count', color='counting_status', barmode='stack')
-        st.plotly_chart(fig, use_container_width=True)
-    
+        resolution = st.selectbox("Resolution", list(RESOLUTIONS), key='timeline_resolution')
     with col2:
-        st.markdown("#### 🏆 Leading Party")
-        party = df.groupby('party')['counted_votes'].sum().reset_index()
-        fig = px.pie(party, values='counted_votes', names='party')
-        st.plotly_chart(fig, use_container_width=True)
+        by = st.radio("Break down by", ['party', 'region'], horizontal=True, key='timeline_by')
+    with col3:
+        interval = float(os.environ.get('ELECTION_REFRESH_SECONDS', 5))
+        live = st.toggle(f"Auto-refresh every {interval:g}s", value=interval > 0, disabled=interval <= 0,
+                         key='counting_auto_refresh')
+    
+    # Only this fragment reruns on the timer; it redraws its stored view
+    # and rebuilds nothing until the shared dataset revision advances
+    st.fragment(counting_live, run_every=interval if live else None)(resolution, by)
     
-    st.dataframe(df[['constituency_name', 'party', 'votes', 'counting_status']], use_container_width=True)
+    paginated_table(df, 'counting_table', get_sort_index(),
+                    columns=['constituency_name', 'party', 'votes', 'counting_status'])
 
 def winner_prediction():
     """Winner prediction"""
     st.markdown("# 🏆 Winner Prediction - AI-Powered Analysis")
     
-    df = st.session_state.election_data
+    with span('data') as record:
+        entry = get_entry()
+        cube = entry.aggregates
+        record.add(rows=cube.n_rows)
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        model = st.selectbox("Model", ['Ensemble', 'Linear Regression', 'Random Forest', 'Bayesian'])
+        model = st.selectbox("Model", list(MODELS))
     
     with col2:
         confidence = st.slider("Confidence", 0.80, 0.99, 0.95, 0.01)
@@ -340,8 +612,12 @@ def winner_prediction():
     st.markdown("---")
     
     if st.session_state.get('prediction_run', False):
-        predictions = predict_winner_ensemble(df)
+        fitted, revision = run_job(f"{model} model", model, fit_model, model, entry.frame, cube)
+        if fitted is None:
+            return
+        predictions = fitted.predict(confidence)
         winner = predictions.iloc[0]
+        filters = {'model': model, 'confidence': confidence, 'revision': revision}
         
         st.markdown(f"""
             <div class="winner-card">
@@ -354,26 +630,74 @@ def winner_prediction():
         
         with col1:
             st.markdown("#### 📊 Win Probability by Party")
-            fig = px.bar(predictions, x='party', y='win_probability',
-                        color='win_probability',
-                        color_continuous_scale='RdYlGn')
+            fig = cached_figure('prediction', 'win_probability', filters, lambda: px.bar(
+                predictions, x='party', y='win_probability',
+                color='win_probability',
+                color_continuous_scale='RdYlGn'))
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("#### 📈 Predicted Vote Distribution")
-            fig = px.pie(predictions, values='predicted_votes', names='party')
+            fig = cached_figure('prediction', 'predicted_votes', filters, lambda: px.pie(
+                predictions, values='predicted_votes', names='party'))
             st.plotly_chart(fig, use_container_width=True)
         
         st.dataframe(predictions, use_container_width=True)
+        
+        st.markdown("---")
+        st.markdown("#### 🎲 Seat Projection (Monte Carlo)")
+        draws = st.select_slider("Simulations", [10_000, 25_000, 50_000, 100_000], value=100_000)
+        projection, revision = run_job("Seat projection", draws, project_seats, cube, draws, seed=42)
+        if projection is None:
+            return
+        seats = projection.summary(confidence)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🏛️ Seats", projection.n_constituencies)
+        with col2:
+            st.metric("🎯 Majority", projection.majority)
+        with col3:
+            st.metric("✅ Already Decided", projection.decided)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"#### 📊 Expected Seats ({confidence:.0%} interval)")
+            def expected_seats_bar():
+                return go.Figure(go.Bar(
+                    x=seats['party'], y=seats['expected_seats'],
+                    error_y=dict(type='data', symmetric=False,
+                                 array=seats['seats_upper'] - seats['expected_seats'],
+                                 arrayminus=seats['expected_seats'] - seats['seats_lower'])))
+            fig = cached_figure('prediction', 'expected_seats',
+                                {'draws': draws, 'confidence': confidence, 'revision': revision},
+                                expected_seats_bar)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.markdown("#### 📈 Seat Distribution")
+            fig = cached_figure('prediction', 'seat_distribution', {'draws': draws, 'revision': revision}, lambda: px.bar(
+                projection.seat_distribution(), x='seats', y='probability', color='party',
+                barmode='overlay', opacity=0.6))
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(seats, use_container_width=True)
 
 def module1_page():
     """Module 1: Vote Share Analysis"""
     st.markdown("# 📊 Module 1: Vote Share & Descriptive Analysis")
     
-    df = st.session_state.election_data
+    with span('data') as record:
+        entry = get_entry()
+        cube = entry.aggregates
+        record.add(rows=cube.n_rows)
     
     # Stats
-    stats = df.groupby('party')['votes'].agg(['sum', 'mean', 'median', 'std', 'min', 'max']).reset_index()
+    with span('aggregate') as record:
+        data = pages.module1_data(entry)
+        stats = data['stats']
+        record.add(rows=cube.n_rows, payload=stats)
     stats.columns = ['Party', 'Total Votes', 'Mean', 'Median', 'Std Dev', 'Min', 'Max']
     
     st.markdown("#### 📋 Statistical Summary")
@@ -383,47 +707,84 @@ def module1_page():
     
     with col1:
         st.markdown("#### 📊 Vote Share Distribution")
-        party_share = df.groupby('party')['votes'].sum().reset_index()
-        party_share['percentage'] = (party_share['votes'] / party_share['votes'].sum() * 100).round(2)
-        fig = px.pie(party_share, values='percentage', names='party', title='Vote Share %')
+        fig = cached_figure('module1', 'vote_share', None, lambda: px.pie(
+            data['vote_share'], values='percentage', names='party', title='Vote Share %'))
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.markdown("#### 📈 Performance Metrics")
-        fig = px.box(df, x='party', y='votes', color='party', title='Vote Distribution by Party')
+        fig = cached_figure('module1', 'vote_box', None, lambda: box_figure(
+            *pages.vote_box(entry), 'party', 'votes',
+            title='Vote Distribution by Party'))
         st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("#### 📊 Vote Share Histogram")
+    fig = cached_figure('module1', 'vote_share_histogram', None, lambda: histogram_figure(
+        pages.vote_share_bins(entry),
+        title='Constituency Vote Share per Party Row', x_title='vote share %'))
+    st.plotly_chart(fig, use_container_width=True)
 
 def module2_page():
     """Module 2: Regional Comparison"""
     st.markdown("# 🗺️ Module 2: Comparative Dashboard by Region")
     
-    df = st.session_state.election_data
+    with span('data') as record:
+        entry = get_entry()
+        cube = entry.aggregates
+        record.add(rows=cube.n_rows)
     
-    selected_regions = st.multiselect("Select Regions", df['region'].unique(), 
-                                     default=list(df['region'].unique()[:3]))
+    selected_regions = st.multiselect("Select Regions", cube.regions, 
+                                     default=cube.regions[:3], key='filter_regions')
     
     if selected_regions:
-        filtered = df[df['region'].isin(selected_regions)]
+        with span('aggregate') as record:
+            data = pages.module2_data(entry, selected_regions)
+            comparison, summary, party_stats = data['comparison'], data['summary'], data['party_stats']
+            record.add(rows=comparison.size, payload=party_stats)
+        filters = {'regions': selected_regions}
         
         col1, col2 = st.columns([2, 1])
         
         with col1:
             st.markdown("#### 📊 Regional Comparison")
-            regional = filtered.groupby(['region', 'party'])['votes'].sum().reset_index()
-            fig = px.bar(regional, x='region', y='votes', color='party', 
-                        barmode='group', title='Votes by Region and Party')
+            fig = cached_figure('module2', 'regional_comparison', filters, lambda: px.bar(
+                comparison.stack().rename('votes').reset_index(), x='region', y='votes', color='party',
+                barmode='group', title='Votes by Region and Party'))
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("#### 📈 Regional Metrics")
-            metrics = filtered.groupby('region')['votes'].sum().reset_index()
-            fig = px.bar(metrics, y='region', x='votes', orientation='h',
-                        color='votes', title='Total Votes by Region')
+            fig = cached_figure('module2', 'regional_metrics', filters, lambda: px.bar(
+                comparison.sum(axis=1).rename('votes').reset_index(), y='region', x='votes',
+                orientation='h', color='votes', title='Total Votes by Region'))
             st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("#### 📋 Cross-Regional Analysis")
-        comparison = filtered.pivot_table(values='votes', index='region', columns='party', aggfunc='sum', fill_value=0)
         st.dataframe(comparison, use_container_width=True)
+        
+        st.markdown("#### 🧮 Turnout & Counting Progress")
+        st.dataframe(summary, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### 🎯 Vote Share by Region (%)")
+            fig = cached_figure('module2', 'share_heatmap', filters, lambda: px.imshow(
+                party_stats.pivot(index='region', columns='party', values='share_pct')
+                .reindex(index=comparison.index, columns=comparison.columns),
+                text_auto='.1f', color_continuous_scale='Blues', aspect='auto'))
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.markdown("#### ⚖️ Index vs National (100 = national share)")
+            fig = cached_figure('module2', 'index_heatmap', filters, lambda: px.imshow(
+                party_stats.pivot(index='region', columns='party', values='index_vs_national')
+                .reindex(index=comparison.index, columns=comparison.columns),
+                text_auto='.0f', color_continuous_scale='RdBu', color_continuous_midpoint=100,
+                aspect='auto'))
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(party_stats, use_container_width=True, hide_index=True)
 
 def about_page():
     """About page"""
@@ -477,11 +838,198 @@ def about_page():
     Username: `admin`  
     Password: `password123`
     """)
+    
+    if st.session_state.data_version is not None:
+        with st.expander("💾 Dataset Memory"):
+            st.dataframe(memory_report(get_dataset()), use_container_width=True)
+            st.dataframe(pd.DataFrame(get_registry().stats()), use_container_width=True)
+            st.json(get_figure_cache().stats())
+            st.json({'background_jobs': get_jobs().stats()})
+            if results_file():
+                st.json(load_results_file(results_file()).report)
+
+def swing_page():
+    """Swing against the previous election"""
+    st.markdown("# 🔄 Swing Analysis - Change Since Previous Election")
+    
+    with span('data') as record:
+        swing = get_swing()
+        record.add(rows=swing.current.n_constituencies)
+    
+    summary = swing.summary()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🔗 Matched", summary['matched'])
+    with col2:
+        st.metric("✏️ Renamed", summary['renamed'])
+    with col3:
+        st.metric("🆕 New", summary['new'])
+    with col4:
+        st.metric("🗑️ Abolished", summary['abolished'])
+    
+    st.markdown("---")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📊 National Swing (share points)")
+        fig = cached_figure('swing', 'national', None, lambda: px.bar(
+            swing.national_swing().reset_index(), x='party', y='swing_pts', color='swing_pts',
+            color_continuous_scale='RdYlGn', color_continuous_midpoint=0))
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.markdown("#### 🗺️ Regional Swing (share points)")
+        fig = cached_figure('swing', 'regional', None, lambda: px.imshow(
+            swing.region_swing(), text_auto='.1f', color_continuous_scale='RdYlGn',
+            color_continuous_midpoint=0, aspect='auto'))
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("#### 🏛️ Uniform Swing Seat Projection")
+    with span('aggregate') as record:
+        projection = swing.uniform_swing_projection()
+        record.add(rows=swing.current.n_constituencies, payload=projection)
+    st.dataframe(projection, use_container_width=True, hide_index=True)
+    
+    st.markdown("#### 📋 Largest Constituency Swings")
+    party = st.selectbox("Party", swing.current.parties, key='swing_party')
+    with span('aggregate') as record:
+        rows = swing.constituency_swing()
+        rows = rows[rows['party'] == party]
+        rows = rows.loc[rows['share_swing_pts'].abs().nlargest(25).index]
+        record.add(rows=len(rows), payload=rows)
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+def anomalies_page():
+    """Suspicious returns"""
+    st.markdown("# 🚨 Anomaly Detection - Suspicious Returns")
+    
+    with span('data') as record:
+        detector = get_anomalies()
+        record.add(rows=detector.cube.n_rows)
+    
+    with span('aggregate') as record:
+        flags = detector.flags()
+        record.add(rows=detector.cube.n_rows, payload=flags)
+    summary = flags['check'].value_counts()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📈 Vote Outliers", int(summary.get('vote_z_score', 0)))
+    with col2:
+        st.metric("🔢 Over-counts", int(summary.get('over_count', 0)),
+                  help="Counts that overtook the projected votes; votes were raised to match")
+    with col3:
+        st.metric("👥 Turnout > 100%", int(summary.get('turnout_over_100', 0)))
+    with col4:
+        st.metric("📊 Turnout Outliers", int(summary.get('turnout_z_score', 0)))
+    
+    st.markdown("---")
+    
+    checks = st.multiselect("Checks", list(summary.index), default=list(summary.index),
+                            key='anomaly_checks')
+    st.markdown("#### 📋 Flagged Returns")
+    st.dataframe(flags[flags['check'].isin(checks)].head(500), use_container_width=True, hide_index=True)
+    
+    st.markdown("#### 🔢 Digit Tests")
+    tests = detector.digit_tests()
+    st.dataframe(tests, use_container_width=True, hide_index=True)
+    
+    col1, col2 = st.columns(2)
+    for col, test, title in ((col1, 'benford_first_digit', 'First Digit vs Benford'),
+                             (col2, 'last_digit', 'Last Digit vs Uniform')):
+        with col:
+            fig = cached_figure('anomalies', test, None, lambda test=test, title=title: px.bar(
+                detector.digit_distribution(test), x='digit', y=['observed', 'expected'],
+                barmode='group', title=title))
+            st.plotly_chart(fig, use_container_width=True)
+    st.caption("Benford's law is only tested where a party's votes span two orders of magnitude.")
+
+def performance_page():
+    """Render latency and phase timings"""
+    st.markdown("# ⏱️ Performance")
+    
+    metrics = get_metrics()
+    latency = metrics.page_latency()
+    
+    if latency.empty:
+        st.info("No page renders recorded yet.")
+        return
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📊 Page Latency (ms)")
+        st.plotly_chart(px.bar(latency.melt(id_vars='page', value_vars=['p50_ms', 'p95_ms'],
+                                            var_name='percentile', value_name='ms'),
+                               x='page', y='ms', color='percentile', barmode='group'),
+                        use_container_width=True)
+    
+    with col2:
+        st.markdown("#### 📋 Latency by Page")
+        st.dataframe(latency.round(1), use_container_width=True)
+    
+    st.markdown("#### 🧩 Phases")
+    st.dataframe(metrics.span_summary().round(1), use_container_width=True)
+    
+    st.markdown("#### 📤 Prometheus Export")
+    text = metrics.prometheus()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ Download metrics", text, file_name='election_metrics.prom',
+                           mime='text/plain')
+    with col2:
+        if st.button("💾 Write metrics file"):
+            path = metrics.dump_prometheus(os.environ.get('ELECTION_METRICS_FILE', 'election_metrics.prom'))
+            st.success(f"Written to {path}")
+    with st.expander("Preview"):
+        st.code(text, language='text')
+    
+    feed = get_feed()
+    if feed is not None:
+        st.markdown("#### 📡 Live Feed")
+        st.json(feed.stats.snapshot())
 
 # ============================================================================
 # MAIN APP
 # ============================================================================
 
+PAGES = {
+    "🏠 Home": home_page,
+    "ℹ️ About": about_page,
+    "📊 Voting Dashboard": voting_dashboard,
+    "🧮 Counting Dashboard": counting_dashboard,
+    "🏆 Winner Prediction": winner_prediction,
+    "📈 Module 1: Vote Share": module1_page,
+    "🗺️ Module 2: Regional Comparison": module2_page,
+    "🔄 Swing Analysis": swing_page,
+    "🚨 Anomalies": anomalies_page,
+    "⏱️ Performance": performance_page,
+}
+
+def render_page(page, profile_engine=None):
+    """Render one page inside a metrics trace, optionally under a profiler
+
+    The wait before re-polling a running background job happens after the
+    trace closes, so it does not count towards the page's latency.
+    """
+    st.session_state.job_poll = None
+    with get_metrics().rerun(page):
+        if profile_engine is None:
+            PAGES[page]()
+        else:
+            with Profile(profile_engine) as profile:
+                PAGES[page]()
+    if profile_engine is not None:
+        with st.expander(f"🔬 Profile ({profile.engine})", expanded=True):
+            if profile.engine == 'pyinstrument':
+                st.components.v1.html(profile.report, height=600, scrolling=True)
+            else:
+                st.code(profile.report, language='text')
+    if st.session_state.job_poll is not None:
+        time.sleep(st.session_state.job_poll)
+        st.rerun()
+
 def main():
     if not st.session_state.authenticated:
         login_page()
@@ -492,31 +1040,28 @@ def main():
             st.markdown(f"**User:** {st.session_state.get('username', 'admin')}")
             st.markdown("---")
             
-            page = st.radio("Navigation", 
-                           ["🏠 Home", "ℹ️ About", "📊 Voting Dashboard", 
-                            "🧮 Counting Dashboard", "🏆 Winner Prediction",
-                            "📈 Module 1: Vote Share", "🗺️ Module 2: Regional Comparison"])
+            page = st.radio("Navigation", list(PAGES))
+            
+            profile_engine = None
+            if is_admin():
+                st.markdown("---")
+                if st.toggle("🔬 Profile this page", key='profile_page'):
+                    engines = ['cprofile', 'pyinstrument'] if pyinstrument else ['cprofile']
+                    profile_engine = st.radio("Profiler", engines, horizontal=True, key='profile_engine')
             
             st.markdown("---")
             if st.button("🚪 Logout"):
+                detach_dataset()
                 st.session_state.authenticated = False
                 st.rerun()
         
+        # Live feed starts once a dataset is attached
+        hold_dataset()
+        get_entry()
+        get_feed()
+        
         # Main content
-        if page == "🏠 Home":
-            home_page()
-        elif page == "ℹ️ About":
-            about_page()
-        elif page == "📊 Voting Dashboard":
-            voting_dashboard()
-        elif page == "🧮 Counting Dashboard":
-            counting_dashboard()
-        elif page == "🏆 Winner Prediction":
-            winner_prediction()
-        elif page == "📈 Module 1: Vote Share":
-            module1_page()
-        elif page == "🗺️ Module 2: Regional Comparison":
-            module2_page()
+        render_page(page, profile_engine)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from election.anomalies import AnomalyDetector
+from election.generator import build_election_data
+from election.registry import DatasetRegistry
+from election.schema import compact_frame
+
+
+class OverCountTest(unittest.TestCase):
+
+    def setUp(self):
+        registry = DatasetRegistry()
+        self.entry = registry.get(registry.publish(compact_frame(build_election_data(seed=5))))
+        frame = self.entry.frame
+        self.row = frame.iloc[0]
+        self.excess = 1234
+        self.update = {
+            'constituency_name': self.row['constituency_name'], 'party': self.row['party'],
+            'counted_votes': int(self.row['votes'] - self.row['counted_votes']) + self.excess,
+        }
+
+    def detector(self):
+        entry = self.entry
+        return entry.derived('anomalies', lambda _: AnomalyDetector(entry.aggregates,
+                                                                    over_count=entry.over_count))
+
+    def over_counts(self, detector):
+        flags = detector.flags()
+        return flags[flags['check'] == 'over_count']
+
+    def test_over_count_is_flagged_after_votes_are_raised(self):
+        detector = self.detector()
+        self.assertEqual(len(self.over_counts(detector)), 0)
+        summary = self.entry.apply_counts([self.update])
+        self.assertEqual(summary['over_counted'], 1)
+
+        flagged = self.over_counts(detector)
+        self.assertEqual(len(flagged), 1)
+        self.assertEqual(flagged['constituency_name'].iloc[0], self.row['constituency_name'])
+        self.assertEqual(flagged['party'].iloc[0], self.row['party'])
+        self.assertEqual(flagged['value'].iloc[0], self.excess)
+        self.assertAlmostEqual(flagged['score'].iloc[0], self.excess * 100 / self.row['votes'], places=2)
+
+    def test_evidence_outlives_the_batch(self):
+        self.entry.apply_counts([self.update])
+        self.entry.apply_counts([dict(self.update, counted_votes=-50)])
+        self.assertEqual(int(self.entry.over_count.sum()), self.excess)
+        # A detector first built after the batches still sees the over-count
+        self.assertEqual(self.over_counts(self.detector())['value'].tolist(), [self.excess])
+
+    def test_counts_within_votes_are_not_flagged(self):
+        self.entry.apply_counts([dict(self.update, counted_votes=0)])
+        self.assertFalse(np.any(self.entry.over_count))
+        self.assertEqual(len(self.over_counts(self.detector())), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from election.aggregates import AggregateCube
+from election.anomalies import AnomalyDetector
+from election.constituencies import ConstituencyTable
+from election.feed import FeedConsumer, random_updates
+from election.filters import FilterIndex
+from election.generator import build_election_data
+from election.registry import DatasetRegistry
+from election.schema import compact_frame
+from election.swing import SwingIndex
+from election.table import SortIndex
+from election.timeline import TimelineStore
+from election.winners import WinnersTable
+
+UPDATES = 3000
+
+
+class FeedAgainstPagesTest(unittest.TestCase):
+    """A live feed applying counts while page builders read the same entry"""
+
+    def setUp(self):
+        registry = DatasetRegistry()
+        self.entry = registry.get(registry.publish(compact_frame(build_election_data(seed=7))))
+        self.previous = AggregateCube(compact_frame(build_election_data(seed=8)))
+        rng = np.random.default_rng(0)
+        handle, self.path = tempfile.mkstemp(suffix='.ndjson')
+        with os.fdopen(handle, 'w') as f:
+            for update in random_updates(self.entry.frame, rng, UPDATES):
+                f.write(json.dumps(update) + '\n')
+
+        # Switch threads as often as possible to widen check-then-use races
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+        os.unlink(self.path)
+
+    def read_pages(self):
+        entry = self.entry
+        cube = entry.aggregates
+        entry.derived('sort_index', SortIndex).positions('votes')
+        entry.derived('filter_index', FilterIndex).rows(region='North', counting_status='Complete')
+        entry.derived('timeline', lambda _: TimelineStore(entry.aggregates)).progress('minute')
+        self.assertIsNotNone(cube.party_stats)
+        cube.party_distribution('North')
+        cube.top_constituencies(party='Party A')
+        cube.region_summary()
+        cube.region_party_stats(cube.regions)
+        winners = entry.derived('winners', lambda _: WinnersTable(entry.aggregates))
+        winners.closest(5)
+        winners.seat_tally()
+        constituencies = entry.derived('constituencies', lambda _: ConstituencyTable(entry.aggregates))
+        constituencies.frame()
+        constituencies.region_turnout()
+        entry.derived('anomalies', lambda _: AnomalyDetector(entry.aggregates)).flags()
+        entry.derived('swing', lambda _: SwingIndex(entry.aggregates, self.previous)).constituency_swing()
+
+    def test_pages_stay_consistent_under_feed(self):
+        self.read_pages()
+        feed = FeedConsumer(f"file://{self.path}", self.entry.apply_counts,
+                            batch_window=0.001, max_batch=25).start()
+        try:
+            deadline = time.time() + 60
+            while feed.stats.updates < UPDATES and time.time() < deadline:
+                self.read_pages()
+        finally:
+            feed.stop()
+        self.assertEqual(feed.stats.updates, UPDATES)
+        self.assertEqual(feed.stats.apply_errors, 0, feed.stats.last_error)
+
+        # Memoized views read after the last batch match a fresh rebuild
+        cube, fresh = self.entry.aggregates, AggregateCube(self.entry.frame.copy())
+        pd.testing.assert_frame_equal(cube.party_distribution('North'), fresh.party_distribution('North'))
+        pd.testing.assert_frame_equal(cube.region_summary(), fresh.region_summary())
+        pd.testing.assert_frame_equal(cube.party_stats, fresh.party_stats)
+        winners = self.entry.derived('winners', None)
+        pd.testing.assert_frame_equal(winners.seat_tally(), WinnersTable(fresh).seat_tally())
+        constituencies = self.entry.derived('constituencies', None)
+        pd.testing.assert_frame_equal(constituencies.frame(), ConstituencyTable(fresh).frame())
+
+
+if __name__ == '__main__':
+    unittest.main()
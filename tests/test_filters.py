@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from election.filters import FilterIndex
+
+
+class FilterIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            'region': ['North', 'South', 'North', 'East', 'South', 'North'],
+            'party': ['A', 'B', 'B', 'A', 'A', 'C'],
+            'counting_status': ['Complete', 'Pending', 'In Progress', 'Complete', 'Complete', 'Pending'],
+        })
+        self.index = FilterIndex(self.frame)
+
+    def expected(self, **filters):
+        mask = np.ones(len(self.frame), dtype=bool)
+        for dim, value in filters.items():
+            values = value if isinstance(value, list) else [value]
+            mask &= self.frame[dim].isin(values).to_numpy()
+        return np.flatnonzero(mask)
+
+    def test_matches_boolean_mask(self):
+        for filters in [{}, {'region': 'North'}, {'party': ['A', 'C']},
+                        {'region': ['North', 'South'], 'party': 'A'},
+                        {'region': 'North', 'counting_status': 'Pending'}]:
+            with self.subTest(**filters):
+                np.testing.assert_array_equal(self.index.rows(**filters), self.expected(**filters))
+
+    def test_none_is_ignored(self):
+        np.testing.assert_array_equal(self.index.rows(region=None), np.arange(len(self.frame)))
+
+    def test_unknown_value_matches_nothing(self):
+        self.assertEqual(len(self.index.rows(region='Nowhere')), 0)
+        self.assertEqual(len(self.index.rows(region='North', party='Nope')), 0)
+
+    def test_empty_selection_matches_nothing(self):
+        self.assertEqual(len(self.index.rows(region=[])), 0)
+        self.assertEqual(len(self.index.view(region='North', party=[]).to_frame()), 0)
+
+    def test_partially_unknown_selection_keeps_known_values(self):
+        np.testing.assert_array_equal(self.index.rows(region=['East', 'Nowhere']), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from election import pages
+from election.aggregates import AggregateCube
+from election.anomalies import AnomalyDetector
+from election.constituencies import ConstituencyTable
+from election.generator import STATUSES, build_election_data
+from election.registry import DatasetRegistry
+from election.schema import compact_frame
+from election.winners import WinnersTable
+
+BATCHES = 40
+BATCH_SIZE = 60
+
+
+def random_batch(frame, rng, n):
+    """Count updates mixing increments, corrections, over-counts, status reverts and bad rows"""
+    rows = rng.integers(0, len(frame), n)
+    rows[n // 2:] = rows[:n - n // 2]  # the same rows twice in one batch
+    names = frame['constituency_name'].astype(str).to_numpy()[rows]
+    parties = frame['party'].astype(str).to_numpy()[rows]
+    votes = frame['votes'].to_numpy(dtype=np.int64)[rows]
+    kind = rng.integers(0, 4, n)
+    increments = np.select(
+        [kind == 0, kind == 1, kind == 2],
+        [rng.integers(0, 500, n), -rng.integers(0, 2000, n), votes // 2 + rng.integers(0, 500, n)],
+        rng.integers(-50, 50, n))
+    statuses = np.asarray(STATUSES + (None,), dtype=object)[rng.integers(0, len(STATUSES) + 1, n)]
+    batch = [{'constituency_name': name, 'party': party, 'counted_votes': int(inc), 'counting_status': status}
+             for name, party, inc, status in zip(names, parties, increments, statuses)]
+    batch.append({'constituency_name': 'Nowhere', 'party': parties[0], 'counted_votes': 10})
+    batch.append({'constituency_name': names[0], 'party': parties[0], 'counted_votes': 1,
+                  'counting_status': 'Recounting'})
+    return batch
+
+
+def expected_counts(frame, batch):
+    """counted_votes and counting_status of each touched row after the batch, applied naively"""
+    position = {key: i for i, key in enumerate(zip(frame['constituency_name'].astype(str),
+                                                     frame['party'].astype(str)))}
+    increments, statuses = {}, {}
+    for update in batch:
+        row = position.get((update['constituency_name'], update['party']))
+        if row is None or update.get('counting_status') not in STATUSES + (None,):
+            continue
+        increments[row] = increments.get(row, 0) + update['counted_votes']
+        if update.get('counting_status') is not None:
+            statuses[row] = update['counting_status']
+    counted = frame['counted_votes'].to_numpy(dtype=np.int64)
+    status = frame['counting_status'].astype(str).to_numpy()
+    return ({row: max(int(counted[row]) + inc, 0) for row, inc in increments.items()},
+            {row: statuses.get(row, status[row]) for row in increments})
+
+
+class IncrementalIngestTest(unittest.TestCase):
+    """Random batches applied in place match a rebuild from the updated frame"""
+
+    def setUp(self):
+        registry = DatasetRegistry()
+        self.entry = registry.get(registry.publish(compact_frame(build_election_data(seed=13))))
+        self.rng = np.random.default_rng(13)
+        # Build the maintained objects before any update so every batch reaches them
+        pages.winners(self.entry)
+        pages.constituencies(self.entry)
+        self.entry.derived('anomalies', lambda _: AnomalyDetector(self.entry.aggregates, refresh_every=7))
+
+    def assert_matches_rebuild(self):
+        entry = self.entry
+        cube, fresh = entry.aggregates, AggregateCube(entry.frame.copy())
+        for name in ('const_party_votes', 'const_party_counted', 'party_counted_votes',
+                     'region_party_votes', 'region_status_rows'):
+            np.testing.assert_array_equal(getattr(cube, name), getattr(fresh, name), err_msg=name)
+        np.testing.assert_array_equal(cube.matrix.status, fresh.matrix.status)
+        pd.testing.assert_frame_equal(cube.party_stats, fresh.party_stats)
+        pd.testing.assert_frame_equal(cube.region_summary(), fresh.region_summary())
+
+        winners, rebuilt = pages.winners(entry), WinnersTable(fresh)
+        for name in ('winner', 'runner_up', 'winner_votes', 'runner_up_votes'):
+            np.testing.assert_array_equal(getattr(winners, name), getattr(rebuilt, name), err_msg=name)
+        pd.testing.assert_frame_equal(winners.frame(), rebuilt.frame())
+
+        table, rebuilt = pages.constituencies(entry), ConstituencyTable(fresh)
+        np.testing.assert_array_equal(table.votes_cast, rebuilt.votes_cast)
+        np.testing.assert_array_equal(table.status, rebuilt.status)
+        pd.testing.assert_frame_equal(table.frame(), rebuilt.frame())
+
+        detector, rebuilt = entry.derived('anomalies', None), AnomalyDetector(fresh)
+        np.testing.assert_array_equal(detector.digit_counts, rebuilt.digit_counts)
+        np.testing.assert_array_equal(detector.last_counts, rebuilt.last_counts)
+
+    def assert_frame_columns(self, counted, statuses):
+        frame = self.entry.frame
+        rows = np.fromiter(counted, dtype=np.intp)
+        np.testing.assert_array_equal(frame['counted_votes'].to_numpy()[rows], list(counted.values()))
+        np.testing.assert_array_equal(frame['counting_status'].astype(str).to_numpy()[rows],
+                                      list(statuses.values()))
+        self.assertTrue((frame['counted_votes'] <= frame['votes']).all())
+
+        # Totals and shares of resized constituencies were refreshed in place
+        totals = frame.groupby('constituency_name', observed=True)['votes'].transform('sum')
+        np.testing.assert_array_equal(frame['total_constituency_votes'], totals)
+        np.testing.assert_allclose(frame['vote_share_pct'], (frame['votes'] / totals * 100).round(2))
+
+    def test_random_batches_match_a_rebuild(self):
+        reverted = corrected = over_counted = 0
+        for _ in range(BATCHES):
+            frame = self.entry.frame
+            batch = random_batch(frame, self.rng, BATCH_SIZE)
+            counted, statuses = expected_counts(frame, batch)
+            before = frame['counting_status'].astype(str).to_numpy().copy()
+            old_counted = frame['counted_votes'].to_numpy(dtype=np.int64).copy()
+
+            summary = self.entry.apply_counts(batch)
+
+            self.assertEqual(summary['rejected'], 2)
+            reverted += sum(before[row] == 'Complete' and status != 'Complete'
+                            for row, status in statuses.items())
+            corrected += sum(value < old_counted[row] for row, value in counted.items())
+            over_counted += summary['over_counted']
+            self.assert_frame_columns(counted, statuses)
+            self.assert_matches_rebuild()
+
+        # The random batches did exercise the revert, correction and over-count paths
+        self.assertGreater(reverted, 0)
+        self.assertGreater(corrected, 0)
+        self.assertGreater(over_counted, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
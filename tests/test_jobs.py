@@ -0,0 +1,130 @@
+import threading
+import unittest
+
+from election.aggregates import AggregateCube
+from election.generator import build_election_data
+from election.jobs import JobManager, JobCancelled, CANCELLED, DONE, FAILED
+from election.prediction_model import fit_model
+
+
+def _fail():
+    raise RuntimeError('boom')
+
+
+def _wait(event, job=None):
+    while not event.wait(0.01):
+        job.progress(0.5)
+    job.progress(1.0)
+    return 'finished'
+
+
+def _block(started, event):
+    started.set()
+    event.wait(5)
+    return 'finished'
+
+
+class _Context:
+    """Stand-in job handle that cancels once ``limit`` progress reports were made"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.reports = []
+
+    def progress(self, fraction, message=None):
+        if len(self.reports) >= self.limit:
+            raise JobCancelled('test')
+        self.reports.append(fraction)
+
+
+class JobManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = JobManager(workers=0)
+
+    def tearDown(self):
+        self.jobs.shutdown()
+
+    def finish(self, job_id):
+        try:
+            self.jobs._jobs[job_id].future.exception(timeout=5)
+        except Exception:
+            pass
+        return self.jobs.status(job_id)['status']
+
+    def test_same_key_shares_one_job(self):
+        first = self.jobs.submit('key', sum, [1, 2])
+        self.assertEqual(self.jobs.submit('key', sum, [1, 2]), first)
+        self.assertEqual(self.finish(first), DONE)
+        self.assertEqual(self.jobs.result(first), 3)
+
+    def test_failed_job_is_not_resubmitted_without_restart(self):
+        job_id = self.jobs.submit('key', _fail)
+        self.assertEqual(self.finish(job_id), FAILED)
+        self.assertEqual(self.jobs.submit('key', _fail), job_id)
+        restarted = self.jobs.submit('key', _fail, restart=True)
+        self.assertNotEqual(restarted, job_id)
+
+    def test_cancelled_job_stays_cancelled_until_restart(self):
+        event = threading.Event()
+        job_id = self.jobs.submit('key', _wait, event)
+        self.jobs.cancel(job_id)
+        self.assertEqual(self.finish(job_id), CANCELLED)
+        self.assertEqual(self.jobs.submit('key', _wait, event), job_id)
+        event.set()
+        restarted = self.jobs.submit('key', _wait, event, restart=True)
+        self.assertNotEqual(restarted, job_id)
+        self.assertEqual(self.finish(restarted), DONE)
+        self.assertEqual(self.jobs.result(restarted), 'finished')
+
+    def test_restart_keeps_a_running_job(self):
+        event = threading.Event()
+        job_id = self.jobs.submit('key', _wait, event)
+        self.assertEqual(self.jobs.submit('key', _wait, event, restart=True), job_id)
+        event.set()
+        self.assertEqual(self.finish(job_id), DONE)
+
+    def test_cancel_flag_wins_over_a_finished_result(self):
+        started, event = threading.Event(), threading.Event()
+        job_id = self.jobs.submit('key', _block, started, event)
+        started.wait(5)
+        self.jobs.cancel(job_id)
+        self.assertEqual(self.jobs.status(job_id)['status'], CANCELLED)
+        event.set()
+        self.assertEqual(self.finish(job_id), CANCELLED)
+        with self.assertRaises(JobCancelled):
+            self.jobs.result(job_id)
+
+    def test_restart_replaces_a_finished_job_and_keeps_info(self):
+        job_id = self.jobs.submit('key', sum, [1, 2], info={'revision': 1})
+        self.assertEqual(self.finish(job_id), DONE)
+        self.assertEqual(self.jobs.status(job_id)['info'], {'revision': 1})
+        restarted = self.jobs.submit('key', sum, [1, 2, 3], restart=True, info={'revision': 2})
+        self.assertNotEqual(restarted, job_id)
+        self.assertEqual(self.finish(restarted), DONE)
+        self.assertEqual(self.jobs.result(restarted), 6)
+        self.assertEqual(self.jobs.status(restarted)['info'], {'revision': 2})
+
+
+class FitCancellationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = build_election_data(constituencies_per_region=8, seed=3)
+        self.cube = AggregateCube(self.frame)
+
+    def test_fits_stop_between_stages(self):
+        for name in ('Linear Regression', 'Bayesian'):
+            job = _Context(limit=1)
+            with self.assertRaises(JobCancelled):
+                fit_model(name, self.frame, self.cube, job=job)
+            self.assertEqual(job.reports, [0.0])
+
+    def test_fit_reports_progress_to_completion(self):
+        job = _Context(limit=100)
+        fit_model('Bayesian', self.frame, self.cube, job=job)
+        self.assertEqual(job.reports[:2], [0.0, 0.5])
+        self.assertEqual(job.reports[-1], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
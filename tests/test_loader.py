@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from election.generator import COLUMNS
+from election.loader import LABEL_COLUMNS, load_results, validate_chunk
+
+GOOD = [
+    # region, constituency_name, party, votes, total_voters, counting_status, counted_votes
+    ('North', 'North-1', 'Party A', 500, 2000, 'Complete', 500),
+    ('North', 'North-1', 'Party B', 300, 2000, 'In Progress', 200),
+    (' North ', 'North-2', 'Party A', 100, 1500, None, None),
+    ('South', 'South-1', 'Party A', 700, 3000, 'Pending', 0),
+    ('South', 'South-1', 'Party B', 900, 3000, 'Complete', 900),
+]
+
+BAD = [
+    (('North', 'North-2', None, 50, 1500, 'Complete', 50), 'missing_field'),
+    (('South', 'South-2', 'Party A', np.nan, 1000, 'Complete', 0), 'missing_field'),
+    (('South', 'South-2', 'Party B', -5, 1000, 'Complete', 0), 'negative_votes'),
+    (('South', 'South-2', 'Party C', 10, 1000, 'Complete', -1), 'negative_votes'),
+    (('North', 'North-3', 'Party A', 10, 1000, 'Complete', 11), 'counted_exceeds_votes'),
+    # Counted by its first failing rule only
+    (('North', 'North-3', 'Party B', -10, 1000, 'Recounting', 0), 'negative_votes'),
+    (('North', 'North-3', 'Party C', 10, 1000, 'Recounting', 5), 'unknown_status'),
+]
+
+DUPLICATE = ('North', 'North-1', 'Party A', 999, 2000, 'Complete', 999)
+
+
+def results_frame(rows):
+    return pd.DataFrame(rows, columns=['region', 'constituency_name', 'party', 'votes',
+                                       'total_voters', 'counting_status', 'counted_votes'])
+
+
+def as_chunk(rows):
+    """Rows as the chunk readers yield them, with categorical labels"""
+    chunk = results_frame(rows)
+    for col in LABEL_COLUMNS:
+        chunk[col] = chunk[col].astype('category')
+    return chunk
+
+
+class ValidateChunkTest(unittest.TestCase):
+
+    def test_reject_rules(self):
+        rejects = Counter()
+        clean = validate_chunk(as_chunk(GOOD + [row for row, _ in BAD]), rejects)
+        self.assertEqual(dict(rejects), dict(Counter(reason for _, reason in BAD)))
+        self.assertEqual(len(clean), len(GOOD))
+
+    def test_defaults_and_cleaned_labels(self):
+        clean = validate_chunk(as_chunk(GOOD), Counter())
+        row = clean.iloc[2]
+        self.assertEqual(row['region'], 'North')
+        self.assertEqual(row['counting_status'], 'Complete')
+        self.assertEqual(row['counted_votes'], row['votes'])
+        self.assertEqual(list(clean['region'].cat.categories), ['North', 'South'])
+
+    def test_missing_required_column(self):
+        with self.assertRaises(ValueError):
+            validate_chunk(as_chunk(GOOD).drop(columns='total_voters'), Counter())
+
+
+class LoadResultsTest(unittest.TestCase):
+    """CSV and Parquet files streamed in chunks small enough to split the duplicate"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.source = results_frame(GOOD + [row for row, _ in BAD] + [DUPLICATE])
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def check(self, path):
+        frame, report = load_results(path, chunksize=3)
+        self.assertEqual(list(frame.columns), COLUMNS)
+        self.assertEqual(len(frame), len(GOOD))
+        # The first of two (constituency, party) rows is kept
+        first = frame[(frame['constituency_name'] == 'North-1') & (frame['party'] == 'Party A')]
+        self.assertEqual(first['votes'].tolist(), [500])
+
+        expected = Counter(reason for _, reason in BAD)
+        expected['duplicate'] = 1
+        self.assertEqual(report, {
+            'source': str(path),
+            'rows_read': len(self.source),
+            'rows_loaded': len(GOOD),
+            'rows_rejected': sum(expected.values()),
+            'rejects': dict(expected),
+        })
+
+        totals = frame.groupby('constituency_name', observed=True)['votes'].transform('sum')
+        np.testing.assert_array_equal(frame['total_constituency_votes'], totals)
+        self.assertEqual(frame.groupby('region', observed=True)['constituency_id'].nunique().to_dict(),
+                         {'North': 2, 'South': 1})
+
+    def test_csv(self):
+        path = os.path.join(self.dir, 'results.csv')
+        self.source.to_csv(path, index=False)
+        self.check(path)
+
+    def test_parquet(self):
+        path = os.path.join(self.dir, 'results.parquet')
+        self.source.to_parquet(path, index=False)
+        self.check(path)
+
+    def test_no_valid_rows(self):
+        path = os.path.join(self.dir, 'results.csv')
+        results_frame([row for row, _ in BAD]).to_csv(path, index=False)
+        with self.assertRaises(ValueError):
+            load_results(path)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            load_results(os.path.join(self.dir, 'results.xlsx'))
+
+
+if __name__ == '__main__':
+    unittest.main()
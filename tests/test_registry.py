@@ -0,0 +1,35 @@
+import unittest
+
+from election.generator import build_election_data
+from election.registry import DatasetRegistry
+
+
+class SweepTest(unittest.TestCase):
+    """Holds of sessions that ended without releasing their version"""
+
+    def setUp(self):
+        self.registry = DatasetRegistry()
+        self.old = self.registry.publish(build_election_data(seed=1))
+        self.registry.acquire(self.old, 'closed')
+        self.registry.acquire(self.old, 'open')
+        self.new = self.registry.publish(build_election_data(seed=2))
+        self.registry.acquire(self.new, 'closed')
+
+    def test_sweep_drops_closed_sessions_only(self):
+        alive = {'open'}.__contains__
+        self.assertEqual(self.registry.sweep(alive), 2)
+        self.assertEqual(self.registry.get(self.old).holders, {'open'})
+        self.assertEqual(self.registry.get(self.new).holders, set())
+        self.assertEqual(self.registry.sweep(alive), 0)
+
+    def test_version_pinned_only_by_closed_sessions_is_evicted(self):
+        self.registry.release(self.old, 'open')
+        self.assertIn(self.old, self.registry)
+        self.registry.sweep(lambda holder: False)
+        self.assertNotIn(self.old, self.registry)
+        # The latest version stays resident without holders
+        self.assertIn(self.new, self.registry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+
+from election.simulation import simulate_seats
+
+
+class SimulateSeatsTest(unittest.TestCase):
+
+    def test_national_swing_is_shared_by_a_party_across_seats(self):
+        # Identical close races with no local error: every draw gives all
+        # seats to one party, and both parties win the whole map sometimes
+        counted = [[0, 500, 490]] * 5
+        votes = [[0, 600, 600]] * 5
+        projection = simulate_seats(counted, votes, draws=2000, constituency_sd=0.0,
+                                    national_sd=0.3, seed=1)
+        self.assertTrue(np.isin(projection.seats[:, 1], [0, 5]).all())
+        self.assertEqual(set(np.unique(projection.seats[:, 1])), {0, 5})
+
+    def test_contender_slots_follow_parties(self):
+        # Party 1 faces party 2 in both seats, but a long-shot party 0 moves
+        # it from the first contender slot to the second in the latter
+        counted = [[0, 500, 490], [480, 500, 490]]
+        votes = [[0, 600, 600], [481, 600, 600]]
+        projection = simulate_seats(counted, votes, draws=2000, constituency_sd=0.0,
+                                    national_sd=0.3, seed=2)
+        self.assertTrue(np.isin(projection.seats[:, 1], [0, 2]).all())
+
+    def test_decided_seats_are_not_simulated(self):
+        projection = simulate_seats([[900, 100]], [[1000, 150]], draws=100, seed=3)
+        self.assertTrue((projection.seats[:, 0] == 1).all())
+        self.assertEqual(projection.decided, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from election.snapshot import SnapshotCache, source_key
+
+
+class SnapshotCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = SnapshotCache(self.directory)
+        self.frame = pd.DataFrame({'party': ['A', 'B'], 'votes': [10, 20]})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def files(self):
+        return sorted(p.name for p in self.cache.directory.glob('*.arrow'))
+
+    def test_save_replaces_older_snapshot_of_the_same_name(self):
+        self.cache.save('results', source_key(1), self.frame)
+        self.cache.save('results', source_key(2), self.frame)
+        self.assertEqual(self.files(), [f"results-{source_key(2)}.arrow"])
+
+    def test_names_keep_their_own_snapshots(self):
+        for name in ('results', 'previous-results', 'results-previous'):
+            self.cache.save(name, source_key(name), self.frame)
+        self.cache.save('results', source_key('again'), self.frame)
+        self.assertEqual(len(self.files()), 3)
+        pd.testing.assert_frame_equal(self.cache.load('previous-results', source_key('previous-results'))[0],
+                                      self.frame)
+
+    def test_load_or_build_hits_after_save(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return self.frame, {'rows': 2}
+
+        for _ in range(2):
+            frame, metadata = self.cache.load_or_build('results', source_key(3), build)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(metadata, {'rows': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
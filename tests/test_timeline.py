@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from election.aggregates import AggregateCube
+from election.generator import build_election_data
+from election.timeline import TimelineStore
+
+
+class ProgressTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1_000_030  # half-way into a minute bucket
+        self.cube = AggregateCube(build_election_data(seed=21))
+        self.timeline = TimelineStore(self.cube, clock=lambda: self.now)
+
+    def append(self, party, increment):
+        party_codes = np.array([party])
+        self.timeline.append(self.now, np.array([0]), party_codes, np.array([0]), np.array([increment]))
+
+    def test_baseline_precedes_the_first_bucket(self):
+        self.append(0, 100)
+        self.now += 60
+        self.append(1, 50)
+
+        progress = self.timeline.progress('minute')
+        self.assertTrue(progress.index.is_unique)
+        self.assertTrue(progress.index.is_monotonic_increasing)
+        self.assertEqual(len(progress), 3)
+        self.assertEqual((progress.index[1] - progress.index[0]).total_seconds(), 60)
+
+        base = self.cube.party_counted_votes
+        np.testing.assert_array_equal(progress.iloc[0], base)
+        self.assertEqual(progress.iloc[1, 0] - base[0], 100)
+        self.assertEqual(progress.iloc[2, 1] - base[1], 50)
+
+    def test_empty_timeline_is_only_the_baseline(self):
+        progress = self.timeline.progress('hour', by='region')
+        self.assertEqual(len(progress), 1)
+        self.assertEqual(progress.index[0].timestamp(), self.now)
+
+
+if __name__ == '__main__':
+    unittest.main()